@@ -4,7 +4,6 @@ Base Agent Class
 Foundation for all agents in the agent-based architecture
 """
 
-import json
 import logging
 import textwrap
 from abc import ABC, abstractmethod
@@ -31,6 +30,7 @@ from agents.agent_prompts import (
 )
 from channel_logger import ChannelLogger
 from session import Session
+from workload_tools import json_dumps
 
 
 def chat_completion_to_content_str(content: ChatCompletionMessageParam) -> str:
@@ -186,7 +186,7 @@ Channel: {state_log["channel"]} | Msg ID: {state_log["message_id"]}
 Text Snippet: {state_log["text_snippet"]}
 
 === Messages ===
-{json.dumps(short_messages, indent=2)}
+{json_dumps(short_messages, indent=True)}
 === LLM Response ===
 {state_log["response"] if state_log["response"] else "No response generated"}
 === JSON DATA ===
@@ -1,4 +1,3 @@
-import json
 import os
 import textwrap
 from typing import List, TypedDict
@@ -12,6 +11,7 @@ from openai.types.chat import ChatCompletionMessageParam
 from agents.base_agent import chat_completion_to_content_str
 from channel_logger import ChannelLogger
 from workload_config import AGENT_CONFIG
+from workload_tools import json_dumps
 
 
 class ConversationMemory(TypedDict):
@@ -184,8 +184,8 @@ class MemoryManager:
                 f"Running Messages: {len(messages)}\n"
                 f"All Messages: {len(old_messages)}\n"
                 "Messages:\n"
-                f"{json.dumps(messages, indent=2)}\n"
-                f"Old Messages:\n{json.dumps(old_messages, indent=2)}"
+                f"{json_dumps(messages, indent=True)}\n"
+                f"Old Messages:\n{json_dumps(old_messages, indent=True)}"
             )
         except Exception as e:
             self.channal_logger.log_to_logs(f"❌ Failed to log memory: {str(e)}")
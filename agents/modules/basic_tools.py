@@ -19,6 +19,7 @@ class BasicTools(T3RNModule):
             T3RNTool(
                 name="getRagSmalltalk",
                 function=db_rag_get_smalltalk,
+                embedding_arg="query",
                 description="Search smalltalk knowledge base for casual conversation topics",
                 system_prompt="""
 Tool getRagSmalltalk allows the droid to retrive information about revlevant topics the user might bring up.
@@ -47,6 +48,7 @@ Examples:
             T3RNTool(
                 name="getMechanicDetails",
                 function=db_rag_get_mechanic_details,
+                embedding_arg="query",
                 description="Search game mechanics information from PostgreSQL rag_vectors using Ollama embeddings",
                 system_prompt="""
 Tool getMechanicDetails allows the droid to retrieve detailed information about game mechanics.
@@ -77,6 +79,7 @@ Examples:
             T3RNTool(
                 name="getGameplayDetails",
                 function=db_rag_get_gameplay_details,
+                embedding_arg="query",
                 description="Search gameplay strategies and tactics from PostgreSQL rag_vectors using Ollama embeddings",
                 system_prompt="""
 Tool getGameplayDetails allows the droid to retrieve information about gameplay strategies and tactics.
@@ -107,6 +110,7 @@ Examples:
             T3RNTool(
                 name="getGeneralKnowledge",
                 function=db_rag_get_general_knowledge,
+                embedding_arg="query",
                 description="Search entire knowledge base",
                 system_prompt="""
 Tool getGeneralKnowledge allows the droid to search the entire knowledge base for information.
@@ -131,6 +135,7 @@ This is a broad search tool that searches both general documents and Q&A section
             T3RNTool(
                 name="getLocationDetails",
                 function=db_rag_get_location_details,
+                embedding_arg="query",
                 description="Search location information",
                 system_prompt="""
 Tool getLocationDetails allows the droid to retrieve information about locations in the game.
@@ -161,6 +166,7 @@ Examples:
             T3RNTool(
                 name="getRagBattleDetails",
                 function=db_rag_get_battle_details,
+                embedding_arg="query",
                 description="Search battle information",
                 system_prompt="""
 Tool geRagtBattleDetails allows the droid to retrieve information about battles in the game.
@@ -1,4 +1,4 @@
-import json
+from concurrent.futures import ThreadPoolExecutor
 from typing import List
 
 from agents.modules.module import T3RNModule
@@ -9,38 +9,42 @@ from tools.db_rag_get_boss_details import db_rag_get_boss_details
 from tools.db_rag_get_champion_details import db_rag_get_champion_details
 from tool import T3RNTool
 
+# The champion, boss and champion RAG lookups are independent, they run concurrently on separate pooled connections
+lookup_executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix="ChampionTools")
 
-def getChampionsDetails(champion_name: str, prefer_lore: bool = False, session: Session | None = None) -> str:
-    champion = db_get_champion_details(champion_name)
-    boss = db_rag_get_boss_details(champion_name)
-    champ_rag = db_rag_get_champion_details(champion_name)
+
+def getChampionsDetails(champion_name: str, prefer_lore: bool = False, session: Session | None = None) -> dict:
+    champion_future = lookup_executor.submit(db_get_champion_details, champion_name)
+    boss_future = lookup_executor.submit(db_rag_get_boss_details, champion_name)
+    champ_rag_future = lookup_executor.submit(db_rag_get_champion_details, champion_name)
+
+    champion = champion_future.result()
+    boss = boss_future.result()
+    champ_rag = champ_rag_future.result()
 
     # TODO championMechanics
     # TODO make it session-aware
     if session:
         _exch = session.get_memory().last_exchange()
 
-    response = ""
-
-    if champion["status"] == "success":
-        response += f"{json.dumps(champion)}\n"
-    if boss["status"] == "success":
-        response += f"{json.dumps(boss)}\n"
-    if champ_rag["status"] == "success":
-        response += f"{json.dumps(champ_rag)}\n"
+    # Results are returned as a dict, serialized once by the agent
+    snippets = [result for result in (champion, boss, champ_rag) if result["status"] == "success"]
 
     if champion["status"] != "success":
         champ_list = db_get_champions_list_text()
-        return json.dumps(
-            {
-                "status": "error",
-                "message": f"No details found for champion '{champion_name}'. List of available champions: {champ_list}\n Galactic databased found only few snippets about this champion, but it seems to be not a champion: {response}",
-                "llm_guidance": "You can ask if this is mistake, try to use other tool or use available informations.",
-                "champion_name": champion_name,
-            }
-        )
+        return {
+            "status": "error",
+            "message": f"No details found for champion '{champion_name}'. List of available champions: {champ_list}\n Galactic databased found only few snippets about this champion, but it seems to be not a champion.",
+            "snippets": snippets,
+            "llm_guidance": "You can ask if this is mistake, try to use other tool or use available informations.",
+            "champion_name": champion_name,
+        }
     else:
-        return response
+        return {
+            "status": "success",
+            "champion_name": champion_name,
+            "results": snippets,
+        }
 
 
 class ChampionTools(T3RNModule):
@@ -49,6 +53,7 @@ class ChampionTools(T3RNModule):
             T3RNTool(
                 name="getChampionsDetails",
                 function=lambda champion_name, prefer_lore=False: getChampionsDetails(champion_name, prefer_lore, session),
+                embedding_arg="champion_name",
                 description="Get details about a specific champion from the game. ",
                 system_prompt="""
 Tool getChampionsDetails allows the droid to retrieve information about a specific champion in the game.
@@ -86,6 +91,7 @@ Examples:
             T3RNTool(
                 name="getRAGCharacterDetails",
                 function=lambda champion_name: db_rag_get_champion_details(champion_name),
+                embedding_arg="champion_name",
                 description="Get lore details about a specific champion from the game using natural language (Questions)",
                 system_prompt="""
 Tool getRAGCharacterDetails allows the droid to retrieve information about a specific champion in the game using natural language.
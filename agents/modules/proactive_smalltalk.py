@@ -1,20 +1,23 @@
-import json
 import logging
 import textwrap
+from concurrent.futures import ThreadPoolExecutor
 from typing import List
 
 import numpy as np
 from openai.types.chat import ChatCompletionMessageParam
-from sklearn.metrics.pairwise import cosine_similarity
 
 from agents.modules.module import T3RNModule
 from session import Session
-from tools.db_rag_common import generate_embedding_from_conv, search_qa_similarity
+from tools.db_rag_common import generate_embedding_from_conv, search_qa_similarity, to_vector_literal
 from tools.db_rag_get_smalltalk import db_rag_get_smalltalk_from_embedding
 from workload_config import AGENT_CONFIG
+from workload_tools import json_dumps
 
 logger = logging.getLogger("ProactiveSmallTalk")
 
+# The smalltalk and QA searches are independent, they run concurrently on separate pooled connections
+search_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="ProactiveSmallTalk")
+
 
 class ProactiveSmalltalk(T3RNModule):
     SECTION = "ProactiveSmalltalk"
@@ -32,15 +35,17 @@ class ProactiveSmalltalk(T3RNModule):
         self.injection_cooldowns = dict()
 
     def _cosine_matrix(self, smalltalks: List[dict]) -> np.ndarray:
-        simmilarity_scores = np.zeros((len(smalltalks), len(smalltalks)))
+        if not smalltalks:
+            return np.zeros((0, 0), dtype=np.float32)
 
-        for i in range(len(smalltalks)):
-            for j in range(i + 1, len(smalltalks)):
-                simmilarity_scores[i][j] = cosine_similarity(
-                    smalltalks[i]["embedding"][np.newaxis, :],
-                    smalltalks[j]["embedding"][np.newaxis, :],
-                )
-                simmilarity_scores[j][i] = simmilarity_scores[i][j]
+        # All pairwise cosine similarities as one matrix product of the L2-normalized embeddings
+        embeddings = np.stack([s["embedding"] for s in smalltalks]).astype(np.float32, copy=False)
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        norms[norms == 0] = 1
+        embeddings = embeddings / norms
+
+        simmilarity_scores = embeddings @ embeddings.T
+        np.fill_diagonal(simmilarity_scores, 0)
 
         return simmilarity_scores
 
@@ -87,12 +92,12 @@ class ProactiveSmalltalk(T3RNModule):
 
             self.injection_cooldowns[smalltalk["id"]] -= 1
 
-        logger.info(f"Updated injection cooldowns: {self.injection_cooldowns}")
+        logger.info("Updated injection cooldowns: %s", self.injection_cooldowns)
 
     def remove_duplicate(self, smalltalks: List[dict]) -> List[dict]:
         simmilarity_scores = self._cosine_matrix(smalltalks)
 
-        logger.debug(f"Simmilarity scores matrix:\n{simmilarity_scores}\n")
+        logger.debug("Simmilarity scores matrix:\n%s\n", simmilarity_scores)
 
         smalltalks_clean = self._remove_duplicate(smalltalks, simmilarity_scores)
 
@@ -115,43 +120,64 @@ class ProactiveSmalltalk(T3RNModule):
             self.channel_logger.log_to_tools("Embedding generation failed, aborting smalltalk retrieval")
             return []
 
-        if self.USE_SMALLTALK:
-            smalltalks = db_rag_get_smalltalk_from_embedding(
+        # Converted to the pgvector literal once, shared by the smalltalk and QA searches
+        embedding = to_vector_literal(embedding)
+
+        smalltalks_future = (
+            search_executor.submit(
+                db_rag_get_smalltalk_from_embedding,
                 embedding,
                 RAG_SMALLTALK_SEARCH_LIMIT=4,
+                # Needed for the duplicate check against the QA results
+                include_embedding=True,
             )
+            if self.USE_SMALLTALK
+            else None
+        )
+        questions_answers_future = (
+            search_executor.submit(
+                search_qa_similarity,
+                embedding,
+                limit=4,
+                # Needed for the duplicate check against the smalltalks
+                include_embedding=True,
+            )
+            if self.USE_QA
+            else None
+        )
+
+        if smalltalks_future is not None:
+            smalltalks = smalltalks_future.result()
             for smalltalk in smalltalks:
                 smalltalk["id"] = "st" + str(smalltalk["id"])
         else:
             smalltalks = []
 
-        if self.USE_QA:
-            questions_answers = search_qa_similarity(
-                embedding,
-                limit=4,
-            )
+        if questions_answers_future is not None:
+            questions_answers = questions_answers_future.result()
             for qa in questions_answers:
                 qa["id"] = "qa" + str(qa["id"])
         else:
             questions_answers = []
 
-        # Create copies of lists without embeddings for logging
-        smalltalks_log = [
-            {
-                "content": textwrap.shorten(s["content"], width=100),
-                "similarity": s["similarity"],
-            }
-            for s in smalltalks
-        ]
-        qa_log = [
-            {
-                "content": textwrap.shorten(qa["content"], width=100),
-                "similarity": qa["similarity"],
-            }
-            for qa in questions_answers
-        ]
-
-        logger.info(f"Retrieved smalltalks with similarity: {smalltalks_log} and questions/answers: {qa_log}")
+        # Create copies of lists without embeddings for logging (only built when INFO is enabled)
+        if logger.isEnabledFor(logging.INFO):
+            smalltalks_log = [
+                {
+                    "content": textwrap.shorten(s["content"], width=100),
+                    "similarity": s["similarity"],
+                }
+                for s in smalltalks
+            ]
+            qa_log = [
+                {
+                    "content": textwrap.shorten(qa["content"], width=100),
+                    "similarity": qa["similarity"],
+                }
+                for qa in questions_answers
+            ]
+
+            logger.info("Retrieved smalltalks with similarity: %s and questions/answers: %s", smalltalks_log, qa_log)
 
         smalltalks.extend(questions_answers)
         smalltalks = sorted(smalltalks, key=lambda x: x["similarity"], reverse=True)
@@ -167,7 +193,7 @@ class ProactiveSmalltalk(T3RNModule):
         ]
 
         self.channel_logger.log_to_tools(
-            f"ProactiveSmallTalk injection (Injecting top {self.INJECT_MAX}): {json.dumps(smalltalks_clean_log, indent=2)}"
+            f"ProactiveSmallTalk injection (Injecting top {self.INJECT_MAX}): {json_dumps(smalltalks_clean_log, indent=True)}"
         )
 
         smalltalks_clean = smalltalks_clean[: self.INJECT_MAX] if len(smalltalks_clean) > self.INJECT_MAX else smalltalks_clean
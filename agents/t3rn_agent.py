@@ -2,6 +2,7 @@ import json
 import os
 import random
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Type
 
 import openai
@@ -37,7 +38,19 @@ from channel_logger import ChannelLogger
 from session import Session
 from tool import T3RNTool
 from tools.db_get_champions_list import db_get_champions_list_text
+from tools.db_rag_common import prefetch_query_embeddings
 from workload_config import AGENT_CONFIG
+from workload_tools import json_dumps, json_loads
+
+# Tool calls requested in the same LLM turn run concurrently
+tool_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="T3RNTools")
+
+
+def _timed_call(tool_function: "T3RNTool", function_args: dict) -> tuple:
+    """Run a tool, returns (result, elapsed seconds)"""
+    start_time = time.time()
+    result = tool_function(**function_args)
+    return result, time.time() - start_time
 
 
 class T3RNAgent(Agent):
@@ -160,15 +173,6 @@ class T3RNAgent(Agent):
         else:
             raise Exception("OpenAI API not available or not configured")
 
-    def _is_tool_result_error(self, result_str: str) -> bool:
-        import json
-
-        try:
-            result_json = json.loads(result_str)
-            return isinstance(result_json, dict) and result_json.get("status") == "error"
-        except (json.JSONDecodeError, TypeError):
-            return result_str.strip().lower().startswith(("error:", "tool execution error:"))
-
     def process_and_execute_tools(
         self,
         tool_calls: List["ChatCompletionMessageToolCall"],
@@ -181,14 +185,17 @@ class T3RNAgent(Agent):
 
         self.channel_logger.log_to_logs(f"🔧 Will execute {len(tool_calls)} tools total (including complementary)")
 
-        for idx, tool_call in enumerate(tool_calls):
+        # Arguments and tool lookup are resolved up front, then the tools of one LLM turn run concurrently
+        # (they are independent database/RAG lookups); results are collected in the requested order
+        prepared_calls = []
+        for tool_call in tool_calls:
             function_name = tool_call.function.name
             function_args = tool_call.function.arguments
 
             try:
                 if isinstance(function_args, str):
                     try:
-                        function_args = json.loads(function_args)
+                        function_args = json_loads(function_args)
                     except json.JSONDecodeError as e:
                         error_msg = f"Invalid JSON in arguments: {str(e)}"
                         self.channel_logger.log_to_tools(error_msg)
@@ -202,14 +209,31 @@ class T3RNAgent(Agent):
                     # TODO more soft error handling
                     raise Exception(f"Tool execution failed: {error_msg}")
 
-                start_time = time.time()
+            except Exception as e:
+                self.channel_logger.log_to_logs(f"❌ Error during tool execute: {e}")
+                self.channel_logger.log_to_tools(f"❌ Error during tool execute: {e}")
+                raise Exception(f"Tool execution failed: {str(e)}")
+
+            prepared_calls.append((tool_call, function_name, function_args, tool_function))
+
+        # RAG tools of this turn get their query embeddings from one batched request
+        prefetch_query_embeddings(
+            [
+                function_args[tool_function.embedding_arg]
+                for _, _, function_args, tool_function in prepared_calls
+                if tool_function.embedding_arg and isinstance(function_args.get(tool_function.embedding_arg), str)
+            ]
+        )
+
+        futures = [tool_executor.submit(_timed_call, tool_function, function_args) for _, _, function_args, tool_function in prepared_calls]
+
+        for idx, ((tool_call, function_name, function_args, _), future) in enumerate(zip(prepared_calls, futures)):
+            try:
                 try:
-                    result = tool_function(**function_args)
+                    result, elapsed_time = future.result()
                 except Exception as e:
                     raise Exception(f"Tool execution failed in dramatic way: {e}")
 
-                elapsed_time = time.time() - start_time
-
                 self.channel_logger.log_to_logs(f"🔧 {function_name} executed in {elapsed_time:.3f}s ({len(str(result))} chars)")
                 self.channel_logger.log_tool_call(function_name, function_args, result, idx + 1)
 
@@ -220,7 +244,7 @@ class T3RNAgent(Agent):
                             "name": function_name,
                             "arguments": tool_call.function.arguments
                             if isinstance(tool_call.function.arguments, str)
-                            else json.dumps(tool_call.function.arguments),
+                            else json_dumps(tool_call.function.arguments),
                         },
                     }
                 )
@@ -228,7 +252,7 @@ class T3RNAgent(Agent):
                     {
                         "role": "function",
                         "name": function_name,
-                        "content": str(json.dumps(result)) if isinstance(result, dict) else str(result),
+                        "content": json_dumps(result) if isinstance(result, dict) else str(result),
                     }
                 )
 
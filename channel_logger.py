@@ -9,7 +9,7 @@ import textwrap
 import time
 from typing import Any, Dict, List, Optional
 
-from workload_tools import create_response, send_response
+from workload_tools import create_response, json_dumps, send_response
 
 
 class ChannelLogFormatter(logging.Formatter):
@@ -166,10 +166,8 @@ class ChannelLogger:
         call_number: int = 1,
     ):
         """Log a tool call to Tool Calls channel"""
-        import json
-
         # Format arguments for display
-        args_display = json.dumps(tool_args, indent=2) if tool_args else "No arguments"
+        args_display = json_dumps(tool_args, indent=True) if tool_args else "No arguments"
 
         # Truncate result to 500 bytes max
         result_str = str(result)
@@ -6,21 +6,45 @@ Manages PostgreSQL database connection for the application
 
 import logging
 import os
-from typing import Any, Dict, List, Optional
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set, Tuple
 
 import psycopg2
+import psycopg2.errors
 import psycopg2.extras
+import psycopg2.pool
 
 # Logger
 logger = logging.getLogger("PGSQLHandler")
 
-# Global database connection
-POSTGRES_CONNECTION: Optional[psycopg2.extensions.connection] = None
+
+class PostgresConnection(psycopg2.extensions.connection):
+    """psycopg2 connection that remembers which server-side prepared statements it holds"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared_statements: Set[str] = set()
+
+
+# Default pool size (POSTGRES_POOL_MIN / POSTGRES_POOL_MAX): concurrent tool calls and the lookups
+# inside them (e.g. getChampionsDetails, proactive smalltalk + QA) each borrow their own connection
+DEFAULT_POSTGRES_POOL_MIN = 2
+DEFAULT_POSTGRES_POOL_MAX = 16
+
+# Global database connection pool
+POSTGRES_POOL: Optional[psycopg2.pool.ThreadedConnectionPool] = None
+# ThreadedConnectionPool raises once all connections are taken, callers wait for a free slot instead
+POSTGRES_POOL_SLOTS: Optional[threading.BoundedSemaphore] = None
 
 
 def initialize_postgres_db():
-    """Initialize PostgreSQL database connection (keep it open for regular queries)"""
-    global POSTGRES_CONNECTION
+    """Initialize PostgreSQL database connection pool (connections are kept open for regular queries)"""
+    global POSTGRES_POOL, POSTGRES_POOL_SLOTS
+
+    # Reconnects to the socket server keep the pool that is already open
+    if POSTGRES_POOL is not None:
+        return True
 
     try:
         # Get database configuration from environment
@@ -29,17 +53,28 @@ def initialize_postgres_db():
         user = os.environ["POSTGRES_USER"]
         password = os.environ["POSTGRES_PASSWORD"]
         database = os.environ["POSTGRES_DB"]
+        pool_min = int(os.environ.get("POSTGRES_POOL_MIN", DEFAULT_POSTGRES_POOL_MIN))
+        pool_max = max(pool_min, int(os.environ.get("POSTGRES_POOL_MAX", DEFAULT_POSTGRES_POOL_MAX)))
 
-        logger.info(f"Opening PostgreSQL database connection: {host}:{port}/{database}")
+        logger.info(f"Opening PostgreSQL database connection pool: {host}:{port}/{database} ({pool_min}-{pool_max} connections)")
 
         # Connect to database
-        POSTGRES_CONNECTION = psycopg2.connect(host=host, port=port, user=user, password=password, database=database)
+        POSTGRES_POOL_SLOTS = threading.BoundedSemaphore(pool_max)
+        POSTGRES_POOL = psycopg2.pool.ThreadedConnectionPool(
+            pool_min,
+            pool_max,
+            host=host,
+            port=port,
+            user=user,
+            password=password,
+            database=database,
+            connection_factory=PostgresConnection,
+        )
 
         # Test connection
-        cursor = POSTGRES_CONNECTION.cursor()
-        cursor.execute("SELECT version()")
-        (version,) = cursor.fetchone() or ["Unknown version"]
-        cursor.close()
+        with _connection() as connection, connection.cursor() as cursor:
+            cursor.execute("SELECT version()")
+            (version,) = cursor.fetchone() or ["Unknown version"]
 
         logger.info("PostgreSQL database connected successfully")
         logger.info(f"PostgreSQL version: {version}")
@@ -50,10 +85,58 @@ def initialize_postgres_db():
         import traceback
 
         logger.error(traceback.format_exc())
-        POSTGRES_CONNECTION = None
+        if POSTGRES_POOL is not None:
+            POSTGRES_POOL.closeall()
+        POSTGRES_POOL = None
         return False
 
 
+@contextmanager
+def _connection() -> Iterator[PostgresConnection]:
+    """Borrow a connection from the pool for the duration of the block (closed connections are replaced)"""
+    if POSTGRES_POOL is None:
+        raise ValueError("PostgreSQL connection not initialized. Call initialize_postgres_db() first.")
+
+    pool, slots = POSTGRES_POOL, POSTGRES_POOL_SLOTS
+    with slots:
+        connection = pool.getconn()
+        try:
+            # Queries are read-only: every statement runs in its own implicit transaction
+            # instead of keeping one transaction open for the lifetime of the connection
+            if not connection.autocommit:
+                connection.autocommit = True
+
+            yield connection
+        finally:
+            pool.putconn(connection, close=bool(connection.closed))
+
+
+def _run_query(query: str, params: tuple | list | None, cursor_factory=None) -> list:
+    """Execute a query and fetch all rows using the given cursor factory, [] on error"""
+    try:
+        with _connection() as connection:
+            try:
+                with connection.cursor(cursor_factory=cursor_factory) as cursor:
+                    if params:
+                        cursor.execute(query, params)
+                    else:
+                        cursor.execute(query)
+
+                    return cursor.fetchall()
+
+            except Exception:
+                if not connection.closed:
+                    connection.rollback()
+                raise
+
+    except Exception as e:
+        logger.error(f"Error executing query: {str(e)}")
+        import traceback
+
+        logger.error(traceback.format_exc())
+        return []
+
+
 def execute_query(query: str, params: tuple | list | None = None) -> List[Dict[str, Any]]:
     """
     Execute a raw SQL query on the PostgreSQL database
@@ -65,99 +148,169 @@ def execute_query(query: str, params: tuple | list | None = None) -> List[Dict[s
     Returns:
         List of dictionaries representing rows
     """
-    global POSTGRES_CONNECTION
-    if POSTGRES_CONNECTION is None:
-        raise ValueError("PostgreSQL connection not initialized. Call initialize_postgres_db() first.")
+    # RealDictRow is already a dict subclass, rows are returned without copying
+    return _run_query(query, params, psycopg2.extras.RealDictCursor)
 
-    # Make sure connection is established
-    if not POSTGRES_CONNECTION or POSTGRES_CONNECTION.closed:
-        if not initialize_postgres_db():
-            logger.error("Failed to initialize PostgreSQL database connection")
-            return []
 
-    try:
-        cursor = POSTGRES_CONNECTION.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+def execute_query_tuples(query: str, params: tuple | list | None = None) -> List[tuple]:
+    """
+    Execute a raw SQL query on the PostgreSQL database, rows as plain tuples
 
-        if params:
-            cursor.execute(query, params)
-        else:
-            cursor.execute(query)
+    Cheaper than execute_query for hot paths that read columns by position
+    and only build dicts for the final response.
 
-        rows = cursor.fetchall()
-        result = [dict(row) for row in rows]
-        cursor.close()
-        return result
+    Args:
+        query: SQL query to execute
+        params: Optional parameters for parameterized queries
+
+    Returns:
+        List of tuples representing rows, in SELECT column order
+    """
+    return _run_query(query, params)
+
+
+def execute_prepared(name: str, query: str, params: tuple | list = (), preamble: str = "") -> List[Dict[str, Any]]:
+    """
+    Execute a query as a server-side prepared statement
+
+    The statement is prepared once per connection (sent together with its first EXECUTE),
+    later calls only send `EXECUTE name(...)`, so PostgreSQL parses and plans it once.
+
+    Args:
+        name: Prepared statement name, one per query text
+        query: SQL query with $1, $2, ... placeholders
+        params: Parameter values, in placeholder order
+        preamble: Statements sent ahead of the EXECUTE in the same implicit transaction (e.g. SET LOCAL)
+
+    Returns:
+        List of dictionaries representing rows
+    """
+    execute = f"EXECUTE {name}({', '.join(['%s'] * len(params))})" if params else f"EXECUTE {name}"
+
+    try:
+        with _connection() as connection:
+            # Prepared statements are per connection, each pooled connection prepares on its own first use
+            is_prepared = name in connection.prepared_statements
+            # The query itself uses $n placeholders, literal % must survive psycopg2 parameter formatting
+            statement = execute if is_prepared else f"PREPARE {name} AS {query.replace('%', '%%') if params else query};\n{execute}"
+            if preamble:
+                statement = f"{preamble}\n{statement}"
+
+            try:
+                with connection.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
+                    cursor.execute(statement, params or None)
+                    rows = cursor.fetchall()
+
+                connection.prepared_statements.add(name)
+                return rows
+
+            except Exception as e:
+                if not connection.closed:
+                    connection.rollback()
+
+                # Prepared statements are session state, keep the bookkeeping in sync with the server
+                if isinstance(e, psycopg2.errors.DuplicatePreparedStatement):
+                    connection.prepared_statements.add(name)
+                elif isinstance(e, psycopg2.errors.InvalidSqlStatementName):
+                    connection.prepared_statements.discard(name)
+                raise
 
     except Exception as e:
-        logger.error(f"Error executing query: {str(e)}")
-        import traceback
+        logger.error(f"Error executing prepared statement '{name}': {str(e)}")
+        return []
 
-        logger.error(traceback.format_exc())
-        if POSTGRES_CONNECTION:
-            POSTGRES_CONNECTION.rollback()
+
+def execute_many_queries(queries: Sequence[Tuple[str, tuple | list | None]]) -> List[List[Dict[str, Any]]]:
+    """
+    Execute several independent SELECT queries in a single round-trip
+
+    Every query is wrapped as a json_agg subquery of one combined SELECT, so the
+    server runs them all and returns one row with one JSON column per query.
+
+    Args:
+        queries: Sequence of (query, params) pairs, params use %s placeholders
+
+    Returns:
+        List of row lists, in the same order as the queries
+    """
+    if not queries:
         return []
 
+    columns = []
+    params: List[Any] = []
+    for idx, (query, query_params) in enumerate(queries):
+        columns.append(f"(SELECT COALESCE(json_agg(q{idx}), '[]'::json) FROM ({query}) q{idx}) AS r{idx}")
+        if query_params:
+            params.extend(query_params)
+
+    rows = execute_query(f"SELECT {', '.join(columns)}", params)
+    if not rows:
+        return [[] for _ in queries]
+
+    return [rows[0][f"r{idx}"] for idx in range(len(queries))]
+
 
 def get_postgres_database_info() -> List[str]:
     info = []
 
-    if not POSTGRES_CONNECTION or POSTGRES_CONNECTION.closed:
+    if POSTGRES_POOL is None or POSTGRES_POOL.closed:
         info.append("⚠️  PostgreSQL database not connected")
         return info
 
     try:
-        cursor = POSTGRES_CONNECTION.cursor()
-
-        # Get database version
-        cursor.execute("SELECT version()")
-        (version,) = cursor.fetchone() or ["Unknown version"]
-        info.append(f"📊 PostgreSQL Version: {version}")
-
-        # Get database name
-        cursor.execute("SELECT current_database()")
-        (db_name,) = cursor.fetchone() or ["Unknown database"]
-        info.append(f"🗄️  Database: {db_name}")
-
-        # Get all tables with record counts
-        cursor.execute("SELECT table_name FROM information_schema.tables WHERE table_schema = 'public' ORDER BY table_name")
-        tables = cursor.fetchall()
-
-        if tables:
-            info.append(f"📋 Total Tables: {len(tables)}")
-            info.append("")
-            info.append("### 📊 TABLE RECORD COUNTS")
-            info.append("")
-
-            total_records = 0
-            table_info = []
-
-            for table in tables:
-                table_name = table[0]
-                try:
-                    cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
-                    (count,) = cursor.fetchone() or [0]
-                    table_info.append((table_name, count))
-                    total_records += count
-                except Exception as e:
-                    table_info.append((table_name, f"Error: {str(e)}"))
-
-            # Sort tables by record count (descending)
-            table_info.sort(key=lambda x: x[1] if isinstance(x[1], int) else 0, reverse=True)
-
-            # Display tables with counts
-            for table_name, count in table_info:
-                if isinstance(count, int):
-                    percentage = (count / total_records * 100) if total_records > 0 else 0
-                    info.append(f"📄 {table_name:<25} | {count:>8,} records ({percentage:>5.1f}%)")
-                else:
-                    info.append(f"📄 {table_name:<25} | {count}")
-
-            info.append("")
-            info.append(f"🔢 **Total Records**: {total_records:,}")
-        else:
-            info.append("📋 No tables found in database")
-
-        cursor.close()
+        with _connection() as connection:
+            cursor = connection.cursor()
+
+            # Get database version
+            cursor.execute("SELECT version()")
+            (version,) = cursor.fetchone() or ["Unknown version"]
+            info.append(f"📊 PostgreSQL Version: {version}")
+
+            # Get database name
+            cursor.execute("SELECT current_database()")
+            (db_name,) = cursor.fetchone() or ["Unknown database"]
+            info.append(f"🗄️  Database: {db_name}")
+
+            # Get all tables with record counts
+            cursor.execute("SELECT table_name FROM information_schema.tables WHERE table_schema = 'public' ORDER BY table_name")
+            tables = cursor.fetchall()
+
+            if tables:
+                info.append(f"📋 Total Tables: {len(tables)}")
+                info.append("")
+                info.append("### 📊 TABLE RECORD COUNTS")
+                info.append("")
+
+                total_records = 0
+                table_info = []
+
+                for table in tables:
+                    table_name = table[0]
+                    try:
+                        cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
+                        (count,) = cursor.fetchone() or [0]
+                        table_info.append((table_name, count))
+                        total_records += count
+                    except Exception as e:
+                        table_info.append((table_name, f"Error: {str(e)}"))
+
+                # Sort tables by record count (descending)
+                table_info.sort(key=lambda x: x[1] if isinstance(x[1], int) else 0, reverse=True)
+
+                # Display tables with counts
+                for table_name, count in table_info:
+                    if isinstance(count, int):
+                        percentage = (count / total_records * 100) if total_records > 0 else 0
+                        info.append(f"📄 {table_name:<25} | {count:>8,} records ({percentage:>5.1f}%)")
+                    else:
+                        info.append(f"📄 {table_name:<25} | {count}")
+
+                info.append("")
+                info.append(f"🔢 **Total Records**: {total_records:,}")
+            else:
+                info.append("📋 No tables found in database")
+
+            cursor.close()
 
     except Exception as e:
         info.append(f"⚠️  Error getting PostgreSQL info: {str(e)}")
@@ -166,10 +319,11 @@ def get_postgres_database_info() -> List[str]:
 
 
 def close_postgres_connection():
-    """Close the PostgreSQL database connection"""
-    global POSTGRES_CONNECTION
-
-    if POSTGRES_CONNECTION and not POSTGRES_CONNECTION.closed:
-        POSTGRES_CONNECTION.close()
-        POSTGRES_CONNECTION = None
-        logger.info("PostgreSQL database connection closed")
+    """Close all PostgreSQL database connections of the pool"""
+    global POSTGRES_POOL, POSTGRES_POOL_SLOTS
+
+    if POSTGRES_POOL and not POSTGRES_POOL.closed:
+        POSTGRES_POOL.closeall()
+        POSTGRES_POOL = None
+        POSTGRES_POOL_SLOTS = None
+        logger.info("PostgreSQL database connections closed")
@@ -1,3 +1,4 @@
+import logging
 import os
 from typing import List, Optional
 
@@ -5,6 +6,9 @@ import requests
 
 OLLAMA_HOST = os.getenv("OLLAMA_HOST", "https://localhost:11434")
 
+# Logger
+logger = logging.getLogger("Embedder")
+
 def embed_ollama(text: str, model: str) -> List[float]:
     response = requests.post(OLLAMA_HOST + "/api/embeddings", json={"model": model, "prompt": text}, timeout=30)
     if response.status_code != 200:
@@ -15,9 +19,27 @@ def embed_ollama(text: str, model: str) -> List[float]:
     return embedding
 
 
+def embed_ollama_batch(texts: List[str], model: str) -> List[List[float]]:
+    response = requests.post(OLLAMA_HOST + "/api/embed", json={"model": model, "input": texts}, timeout=30)
+    if response.status_code != 200:
+        raise Exception(f"Failed to get embeddings: {response.text}")
+
+    embeddings = response.json()["embeddings"]
+
+    return embeddings
+
+
 def embd(text: str) -> Optional[List[float]]:
     try:
         return embed_ollama(text, "nomic-embed-text")
     except Exception as e:
         print(f"Error generating embeddings: {e}")
         return None
+
+
+def embd_batch(texts: List[str]) -> Optional[List[List[float]]]:
+    try:
+        return embed_ollama_batch(texts, "nomic-embed-text")
+    except Exception as e:
+        logger.error(f"Error generating batch embeddings: {e}")
+        return None
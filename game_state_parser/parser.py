@@ -1,6 +1,7 @@
 import json
 import logging
-from typing import Optional, Type
+from functools import cached_property
+from typing import Dict, Optional, Type
 
 from . import elements
 from .ui_element import UIElement
@@ -55,8 +56,8 @@ def parse_screen_data(screenData: dict):
     return rootElement
 
 
-def parse_ui_tree(json_raw: str) -> UIElement:
-    data = json.loads(json_raw)
+def parse_ui_tree(json_raw: str | dict) -> UIElement:
+    data = json.loads(json_raw) if isinstance(json_raw, str) else json_raw
     try:
         screenData = data["screenData"]
         return parse_screen_data(screenData)
@@ -66,10 +67,28 @@ def parse_ui_tree(json_raw: str) -> UIElement:
         return parse_screen_data({"Screen": "UnknownScreen", "ScreensData": data})
 
 
+def build_name_index(element: UIElement) -> Dict[str, UIElement]:
+    """
+    Builds name -> element lookup for the whole subtree.
+    Resolves names in the same order as `UIElement.first`: direct children first, then descendants of each child in order.
+    """
+    index: Dict[str, UIElement] = dict(element.children)
+    for child in element.children.values():
+        for name, descendant in build_name_index(child).items():
+            index.setdefault(name, descendant)
+    return index
+
+
 class GameStateParser:
-    def __init__(self, json_raw: str):
+    def __init__(self, json_raw: str | dict):
         self.ui_tree = parse_ui_tree(json_raw)
 
+    @cached_property
+    def elements_by_name(self) -> Dict[str, UIElement]:
+        # Only get_details looks elements up, the index is built on its first call
+        # (the tree does not change after parsing, so it is resolved once)
+        return build_name_index(self.ui_tree)
+
     def build_prompt(self) -> str:
         try:
             return self.ui_tree.build_prompt()
@@ -79,7 +98,7 @@ class GameStateParser:
 
     def get_details(self, name: str) -> str:
         try:
-            element = self.ui_tree.first(name)
+            element = self.elements_by_name.get(name)
             if element:
                 return element.build_prompt()
             else:
@@ -0,0 +1,8 @@
+-- Index lore_records.champion_name for case-insensitive substring lookups.
+-- tools/db_get_lore_details.py searches with `champion_name ILIKE '%name%'`,
+-- which the trigram GIN index serves instead of a sequential scan.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS lore_records_champion_name_trgm
+    ON lore_records USING gin (champion_name gin_trgm_ops);
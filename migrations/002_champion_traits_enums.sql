@@ -0,0 +1,35 @@
+-- Store champion trait categories as enums and cover the trait filter with an index.
+-- tools/db_get_champions_by_traits.py, db_find_strongest_champions.py and
+-- db_find_champions_stronger_than.py filter on rarity / affinity / class with
+-- upper-case string literals, which Postgres now compares as enum OIDs.
+-- The column types are only changed while rarity is still text, so a re-run does not touch
+-- the columns that later migrations (e.g. the champion_search view, 004) depend on.
+
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_type WHERE typname = 'champion_rarity') THEN
+        CREATE TYPE champion_rarity AS ENUM ('LEGENDARY', 'EPIC', 'RARE', 'UNCOMMON', 'COMMON');
+    END IF;
+    IF NOT EXISTS (SELECT 1 FROM pg_type WHERE typname = 'champion_affinity') THEN
+        CREATE TYPE champion_affinity AS ENUM ('RED', 'BLUE', 'GREEN', 'YELLOW', 'PURPLE');
+    END IF;
+    IF NOT EXISTS (SELECT 1 FROM pg_type WHERE typname = 'champion_class') THEN
+        CREATE TYPE champion_class AS ENUM ('ATTACKER', 'DEFENDER', 'SUPPORT');
+    END IF;
+END
+$$;
+
+DO $$
+BEGIN
+    IF (SELECT format_type(atttypid, atttypmod) FROM pg_attribute
+        WHERE attrelid = 'champion_traits'::regclass AND attname = 'rarity') <> 'champion_rarity' THEN
+        ALTER TABLE champion_traits
+            ALTER COLUMN rarity TYPE champion_rarity USING rarity::champion_rarity,
+            ALTER COLUMN affinity TYPE champion_affinity USING affinity::champion_affinity,
+            ALTER COLUMN class TYPE champion_class USING class::champion_class;
+    END IF;
+END
+$$;
+
+CREATE INDEX IF NOT EXISTS champion_traits_rarity_affinity_class
+    ON champion_traits (rarity, affinity, class) INCLUDE (champion_name);
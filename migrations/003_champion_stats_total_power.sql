@@ -0,0 +1,10 @@
+-- Materialize champion power as a stored generated column with a top-k index.
+-- The champion tools sort and filter on attack + defense + health; with the
+-- column indexed, ORDER BY total_power DESC LIMIT n walks the index instead of
+-- computing the sum for every joined row and sorting.
+
+ALTER TABLE champion_stats
+    ADD COLUMN IF NOT EXISTS total_power INT GENERATED ALWAYS AS (attack + defense + health) STORED;
+
+CREATE INDEX IF NOT EXISTS champion_stats_total_power
+    ON champion_stats (total_power DESC) INCLUDE (champion_name);
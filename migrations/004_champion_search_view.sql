@@ -0,0 +1,18 @@
+-- Pre-joined champion traits + power for trait searches.
+-- tools/db_get_champions_by_traits.py reads this view instead of joining
+-- champion_traits to champion_stats on the champion_name string per query.
+--
+-- Champion data changes rarely; refresh after every champion data import:
+--     REFRESH MATERIALIZED VIEW CONCURRENTLY champion_search;
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS champion_search AS
+SELECT ct.id, ct.champion_name, ct.rarity, ct.affinity, ct.class, cs.total_power
+FROM champion_traits ct
+JOIN champion_stats cs ON ct.champion_name = cs.champion_name
+WHERE ct.champion_name IS NOT NULL;
+
+-- Required by REFRESH ... CONCURRENTLY
+CREATE UNIQUE INDEX IF NOT EXISTS champion_search_id ON champion_search (id);
+
+CREATE INDEX IF NOT EXISTS champion_search_traits_power
+    ON champion_search (rarity, affinity, class, total_power DESC);
@@ -0,0 +1,6 @@
+-- Exact, case-insensitive champion name lookups on lore_records.
+-- tools/db_get_lore_details.py tries LOWER(champion_name) = LOWER(name) first
+-- and only falls back to the trigram ILIKE search (migration 001) on a miss.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS lore_records_champion_name_lower
+    ON lore_records (LOWER(champion_name));
@@ -0,0 +1,11 @@
+-- Trigram indexes for the champion / battle details name searches.
+-- tools/db_get_champion_details.py and tools/db_get_battle_details.py search
+-- with `name ILIKE '%query%'` (any substring), which a B-tree cannot serve.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS champion_details_champion_name_trgm
+    ON champion_details USING gin (champion_name gin_trgm_ops);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS battle_details_battle_name_trgm
+    ON battle_details USING gin (battle_name gin_trgm_ops);
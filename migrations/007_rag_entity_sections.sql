@@ -0,0 +1,19 @@
+-- Entity -> chunk_section mapping for the section-filtered QA search.
+-- tools/db_rag_common.py joins rag_qa_vectors against this view instead of
+-- extracting metadata->>'entity_name' from every rag_vectors row per query.
+--
+-- Refresh after every RAG ingestion:
+--     REFRESH MATERIALIZED VIEW CONCURRENTLY entity_sections;
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS entity_sections AS
+SELECT DISTINCT metadata->>'chunk_section' AS chunk_section, metadata->>'entity_name' AS entity_name
+FROM rag_vectors
+WHERE metadata->>'chunk_section' IS NOT NULL
+AND metadata->>'entity_name' IS NOT NULL;
+
+-- Unique index, required by REFRESH ... CONCURRENTLY
+CREATE UNIQUE INDEX IF NOT EXISTS entity_sections_section_entity
+    ON entity_sections (chunk_section, entity_name);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS rag_qa_vectors_entity_name
+    ON rag_qa_vectors ((metadata->>'entity_name'));
@@ -0,0 +1,10 @@
+-- Approximate nearest neighbour (HNSW) indexes for the RAG similarity searches.
+-- tools/db_rag_common.py orders by `embedding <=> query` (cosine distance) with a LIMIT,
+-- which these indexes serve without computing the distance to every row.
+-- Search breadth is set per query with SET LOCAL hnsw.ef_search.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS rag_vectors_embedding_hnsw
+    ON rag_vectors USING hnsw (embedding vector_cosine_ops) WITH (m = 16, ef_construction = 64);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS rag_qa_vectors_embedding_hnsw
+    ON rag_qa_vectors USING hnsw (embedding vector_cosine_ops) WITH (m = 16, ef_construction = 64);
@@ -0,0 +1,16 @@
+-- Typed columns for the rag_vectors metadata keys used as search filters.
+-- tools/db_rag_common.py filters on chunk_section / is_qa directly instead of
+-- extracting them from the metadata JSONB of every candidate row.
+-- Generated columns stay in sync with the metadata written by the ingestion.
+
+ALTER TABLE rag_vectors
+    ADD COLUMN IF NOT EXISTS chunk_section text GENERATED ALWAYS AS (metadata->>'chunk_section') STORED,
+    ADD COLUMN IF NOT EXISTS entity_name text GENERATED ALWAYS AS (metadata->>'entity_name') STORED,
+    -- NULL when chunk_name is missing, like the original `metadata->>'chunk_name' LIKE '%QA%'` filter
+    ADD COLUMN IF NOT EXISTS is_qa boolean GENERATED ALWAYS AS (metadata->>'chunk_name' LIKE '%QA%') STORED;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS rag_vectors_section_noqa
+    ON rag_vectors (chunk_section) WHERE NOT is_qa;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS rag_vectors_entity_name
+    ON rag_vectors (entity_name);
@@ -0,0 +1,12 @@
+-- Stored lowercase champion name on lore_records.
+-- tools/db_get_lore_details.py lowercases the requested name once on the client and
+-- compares it to champion_name_lc, so no LOWER() is evaluated per row at query time.
+-- Replaces the LOWER(champion_name) expression index from migration 005.
+
+ALTER TABLE lore_records
+    ADD COLUMN IF NOT EXISTS champion_name_lc text GENERATED ALWAYS AS (lower(champion_name)) STORED;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS lore_records_champion_name_lc
+    ON lore_records (champion_name_lc);
+
+DROP INDEX CONCURRENTLY IF EXISTS lore_records_champion_name_lower;
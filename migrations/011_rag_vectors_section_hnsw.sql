@@ -0,0 +1,30 @@
+-- Per-section partial HNSW indexes on rag_vectors.
+-- Every tools/db_rag_get_*.py search except general knowledge filters on one
+-- chunk_section with `chunk_section = '<SECTION>' AND NOT is_qa`; psycopg2 sends the
+-- section as a literal, so the planner matches it to the section's partial index
+-- and the ANN scan only walks that section's graph instead of post-filtering the
+-- global index from migration 008 (which still serves the unfiltered searches).
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS rag_vectors_sec_battles_hnsw
+    ON rag_vectors USING hnsw (embedding vector_cosine_ops) WITH (m = 16, ef_construction = 64)
+    WHERE chunk_section = 'BATTLES' AND NOT is_qa;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS rag_vectors_sec_bosses_hnsw
+    ON rag_vectors USING hnsw (embedding vector_cosine_ops) WITH (m = 16, ef_construction = 64)
+    WHERE chunk_section = 'BOSSES' AND NOT is_qa;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS rag_vectors_sec_champions_hnsw
+    ON rag_vectors USING hnsw (embedding vector_cosine_ops) WITH (m = 16, ef_construction = 64)
+    WHERE chunk_section = 'CHAMPIONS' AND NOT is_qa;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS rag_vectors_sec_gameplay_hnsw
+    ON rag_vectors USING hnsw (embedding vector_cosine_ops) WITH (m = 16, ef_construction = 64)
+    WHERE chunk_section = 'GAMEPLAY' AND NOT is_qa;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS rag_vectors_sec_locations_hnsw
+    ON rag_vectors USING hnsw (embedding vector_cosine_ops) WITH (m = 16, ef_construction = 64)
+    WHERE chunk_section = 'LOCATIONS' AND NOT is_qa;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS rag_vectors_sec_mechanics_hnsw
+    ON rag_vectors USING hnsw (embedding vector_cosine_ops) WITH (m = 16, ef_construction = 64)
+    WHERE chunk_section = 'MECHANICS' AND NOT is_qa;
@@ -0,0 +1,53 @@
+-- Store the RAG embeddings as half precision (pgvector halfvec, 768 dims of nomic-embed-text).
+-- Halves the size of rows and HNSW indexes, so the ANN searches touch half the memory;
+-- tools/db_rag_common.py binds the query embedding as ::halfvec accordingly.
+-- The HNSW indexes from migrations 008 and 011 are built with vector_cosine_ops and
+-- cannot survive the type change, they are dropped with it and rebuilt below.
+
+DO $$
+BEGIN
+    IF (SELECT format_type(atttypid, atttypmod) FROM pg_attribute
+        WHERE attrelid = 'rag_vectors'::regclass AND attname = 'embedding') <> 'halfvec(768)' THEN
+        DROP INDEX IF EXISTS rag_vectors_embedding_hnsw, rag_vectors_sec_battles_hnsw, rag_vectors_sec_bosses_hnsw,
+            rag_vectors_sec_champions_hnsw, rag_vectors_sec_gameplay_hnsw, rag_vectors_sec_locations_hnsw,
+            rag_vectors_sec_mechanics_hnsw;
+        ALTER TABLE rag_vectors ALTER COLUMN embedding TYPE halfvec(768) USING embedding::halfvec(768);
+    END IF;
+
+    IF (SELECT format_type(atttypid, atttypmod) FROM pg_attribute
+        WHERE attrelid = 'rag_qa_vectors'::regclass AND attname = 'embedding') <> 'halfvec(768)' THEN
+        DROP INDEX IF EXISTS rag_qa_vectors_embedding_hnsw;
+        ALTER TABLE rag_qa_vectors ALTER COLUMN embedding TYPE halfvec(768) USING embedding::halfvec(768);
+    END IF;
+END
+$$;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS rag_vectors_embedding_hnsw
+    ON rag_vectors USING hnsw (embedding halfvec_cosine_ops) WITH (m = 16, ef_construction = 64);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS rag_qa_vectors_embedding_hnsw
+    ON rag_qa_vectors USING hnsw (embedding halfvec_cosine_ops) WITH (m = 16, ef_construction = 64);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS rag_vectors_sec_battles_hnsw
+    ON rag_vectors USING hnsw (embedding halfvec_cosine_ops) WITH (m = 16, ef_construction = 64)
+    WHERE chunk_section = 'BATTLES' AND NOT is_qa;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS rag_vectors_sec_bosses_hnsw
+    ON rag_vectors USING hnsw (embedding halfvec_cosine_ops) WITH (m = 16, ef_construction = 64)
+    WHERE chunk_section = 'BOSSES' AND NOT is_qa;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS rag_vectors_sec_champions_hnsw
+    ON rag_vectors USING hnsw (embedding halfvec_cosine_ops) WITH (m = 16, ef_construction = 64)
+    WHERE chunk_section = 'CHAMPIONS' AND NOT is_qa;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS rag_vectors_sec_gameplay_hnsw
+    ON rag_vectors USING hnsw (embedding halfvec_cosine_ops) WITH (m = 16, ef_construction = 64)
+    WHERE chunk_section = 'GAMEPLAY' AND NOT is_qa;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS rag_vectors_sec_locations_hnsw
+    ON rag_vectors USING hnsw (embedding halfvec_cosine_ops) WITH (m = 16, ef_construction = 64)
+    WHERE chunk_section = 'LOCATIONS' AND NOT is_qa;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS rag_vectors_sec_mechanics_hnsw
+    ON rag_vectors USING hnsw (embedding halfvec_cosine_ops) WITH (m = 16, ef_construction = 64)
+    WHERE chunk_section = 'MECHANICS' AND NOT is_qa;
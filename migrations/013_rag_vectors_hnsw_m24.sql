@@ -0,0 +1,44 @@
+-- Rebuild the RAG HNSW indexes with a denser graph (m = 24, ef_construction = 128),
+-- trading build time and index size for higher recall at the small ef_search values
+-- the searches use (tools/db_rag_common.py sets hnsw.ef_search per query from the limit).
+-- New indexes are built next to the migration 012 ones before those are dropped,
+-- so the searches are never left without an index.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS rag_vectors_embedding_hnsw_m24
+    ON rag_vectors USING hnsw (embedding halfvec_cosine_ops) WITH (m = 24, ef_construction = 128);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS rag_qa_vectors_embedding_hnsw_m24
+    ON rag_qa_vectors USING hnsw (embedding halfvec_cosine_ops) WITH (m = 24, ef_construction = 128);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS rag_vectors_sec_battles_hnsw_m24
+    ON rag_vectors USING hnsw (embedding halfvec_cosine_ops) WITH (m = 24, ef_construction = 128)
+    WHERE chunk_section = 'BATTLES' AND NOT is_qa;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS rag_vectors_sec_bosses_hnsw_m24
+    ON rag_vectors USING hnsw (embedding halfvec_cosine_ops) WITH (m = 24, ef_construction = 128)
+    WHERE chunk_section = 'BOSSES' AND NOT is_qa;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS rag_vectors_sec_champions_hnsw_m24
+    ON rag_vectors USING hnsw (embedding halfvec_cosine_ops) WITH (m = 24, ef_construction = 128)
+    WHERE chunk_section = 'CHAMPIONS' AND NOT is_qa;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS rag_vectors_sec_gameplay_hnsw_m24
+    ON rag_vectors USING hnsw (embedding halfvec_cosine_ops) WITH (m = 24, ef_construction = 128)
+    WHERE chunk_section = 'GAMEPLAY' AND NOT is_qa;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS rag_vectors_sec_locations_hnsw_m24
+    ON rag_vectors USING hnsw (embedding halfvec_cosine_ops) WITH (m = 24, ef_construction = 128)
+    WHERE chunk_section = 'LOCATIONS' AND NOT is_qa;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS rag_vectors_sec_mechanics_hnsw_m24
+    ON rag_vectors USING hnsw (embedding halfvec_cosine_ops) WITH (m = 24, ef_construction = 128)
+    WHERE chunk_section = 'MECHANICS' AND NOT is_qa;
+
+DROP INDEX CONCURRENTLY IF EXISTS rag_vectors_embedding_hnsw;
+DROP INDEX CONCURRENTLY IF EXISTS rag_qa_vectors_embedding_hnsw;
+DROP INDEX CONCURRENTLY IF EXISTS rag_vectors_sec_battles_hnsw;
+DROP INDEX CONCURRENTLY IF EXISTS rag_vectors_sec_bosses_hnsw;
+DROP INDEX CONCURRENTLY IF EXISTS rag_vectors_sec_champions_hnsw;
+DROP INDEX CONCURRENTLY IF EXISTS rag_vectors_sec_gameplay_hnsw;
+DROP INDEX CONCURRENTLY IF EXISTS rag_vectors_sec_locations_hnsw;
+DROP INDEX CONCURRENTLY IF EXISTS rag_vectors_sec_mechanics_hnsw;
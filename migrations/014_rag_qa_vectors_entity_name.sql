@@ -0,0 +1,12 @@
+-- Typed entity_name column on rag_qa_vectors, like migration 009 for rag_vectors.
+-- The section-filtered QA search in tools/db_rag_common.py joins and selects it directly
+-- instead of extracting metadata->>'entity_name' from every candidate row.
+-- Replaces the expression index from migration 007.
+
+ALTER TABLE rag_qa_vectors
+    ADD COLUMN IF NOT EXISTS entity_name text GENERATED ALWAYS AS (metadata->>'entity_name') STORED;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS rag_qa_vectors_entity_name_col
+    ON rag_qa_vectors (entity_name);
+
+DROP INDEX CONCURRENTLY IF EXISTS rag_qa_vectors_entity_name;
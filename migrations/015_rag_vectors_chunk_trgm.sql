@@ -0,0 +1,8 @@
+-- Trigram index on rag_vectors.chunk_text for the general knowledge search cascade.
+-- tools/db_rag_common.py first narrows unfiltered searches (no chunk_section) to the chunks
+-- containing the query words with `query <% chunk_text`, which this GIN index serves,
+-- and reranks those candidates by vector distance instead of walking the whole HNSW graph.
+-- pg_trgm is created by migration 001.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS rag_vectors_chunk_trgm
+    ON rag_vectors USING gin (chunk_text gin_trgm_ops) WHERE NOT is_qa;
@@ -0,0 +1,10 @@
+-- Exact, case-insensitive entity name lookups on the RAG tables.
+-- tools/db_rag_common.py answers short section queries (e.g. a champion name) with
+-- `lower(entity_name) = <query>` (ranked by the query embedding) instead of the HNSW search.
+-- entity_name columns come from migrations 009 and 014.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS rag_vectors_entity_name_lower
+    ON rag_vectors (lower(entity_name), chunk_section) WHERE NOT is_qa;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS rag_qa_vectors_entity_name_lower
+    ON rag_qa_vectors (lower(entity_name));
@@ -0,0 +1,5 @@
+-- pg_prewarm (contrib) for the RAG warmup on workload start.
+-- tools/db_rag_common.py warmup_rag loads rag_vectors, rag_qa_vectors and their HNSW
+-- indexes into shared_buffers when this extension is installed, and skips that step otherwise.
+
+CREATE EXTENSION IF NOT EXISTS pg_prewarm;
@@ -0,0 +1,65 @@
+-- Unit-length RAG embeddings searched by inner product.
+-- With every stored embedding L2-normalized, cosine similarity is the plain dot product:
+-- tools/db_rag_common.py normalizes the query vector once and orders by `embedding <#> q`
+-- (negative inner product), which skips the per-candidate norm computation of `<=>`.
+-- A trigger keeps embeddings written by the ingestion normalized, the UPDATEs fix existing rows.
+-- The HNSW indexes are rebuilt with halfvec_ip_ops next to the migration 013 ones before those are dropped.
+
+CREATE OR REPLACE FUNCTION rag_normalize_embedding() RETURNS trigger AS $$
+BEGIN
+    NEW.embedding := l2_normalize(NEW.embedding);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS rag_vectors_normalize_embedding ON rag_vectors;
+CREATE TRIGGER rag_vectors_normalize_embedding
+    BEFORE INSERT OR UPDATE OF embedding ON rag_vectors
+    FOR EACH ROW EXECUTE FUNCTION rag_normalize_embedding();
+
+DROP TRIGGER IF EXISTS rag_qa_vectors_normalize_embedding ON rag_qa_vectors;
+CREATE TRIGGER rag_qa_vectors_normalize_embedding
+    BEFORE INSERT OR UPDATE OF embedding ON rag_qa_vectors
+    FOR EACH ROW EXECUTE FUNCTION rag_normalize_embedding();
+
+UPDATE rag_vectors SET embedding = l2_normalize(embedding) WHERE abs(l2_norm(embedding) - 1) > 1e-3;
+UPDATE rag_qa_vectors SET embedding = l2_normalize(embedding) WHERE abs(l2_norm(embedding) - 1) > 1e-3;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS rag_vectors_embedding_hnsw_ip
+    ON rag_vectors USING hnsw (embedding halfvec_ip_ops) WITH (m = 24, ef_construction = 128);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS rag_qa_vectors_embedding_hnsw_ip
+    ON rag_qa_vectors USING hnsw (embedding halfvec_ip_ops) WITH (m = 24, ef_construction = 128);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS rag_vectors_sec_battles_hnsw_ip
+    ON rag_vectors USING hnsw (embedding halfvec_ip_ops) WITH (m = 24, ef_construction = 128)
+    WHERE chunk_section = 'BATTLES' AND NOT is_qa;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS rag_vectors_sec_bosses_hnsw_ip
+    ON rag_vectors USING hnsw (embedding halfvec_ip_ops) WITH (m = 24, ef_construction = 128)
+    WHERE chunk_section = 'BOSSES' AND NOT is_qa;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS rag_vectors_sec_champions_hnsw_ip
+    ON rag_vectors USING hnsw (embedding halfvec_ip_ops) WITH (m = 24, ef_construction = 128)
+    WHERE chunk_section = 'CHAMPIONS' AND NOT is_qa;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS rag_vectors_sec_gameplay_hnsw_ip
+    ON rag_vectors USING hnsw (embedding halfvec_ip_ops) WITH (m = 24, ef_construction = 128)
+    WHERE chunk_section = 'GAMEPLAY' AND NOT is_qa;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS rag_vectors_sec_locations_hnsw_ip
+    ON rag_vectors USING hnsw (embedding halfvec_ip_ops) WITH (m = 24, ef_construction = 128)
+    WHERE chunk_section = 'LOCATIONS' AND NOT is_qa;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS rag_vectors_sec_mechanics_hnsw_ip
+    ON rag_vectors USING hnsw (embedding halfvec_ip_ops) WITH (m = 24, ef_construction = 128)
+    WHERE chunk_section = 'MECHANICS' AND NOT is_qa;
+
+DROP INDEX CONCURRENTLY IF EXISTS rag_vectors_embedding_hnsw_m24;
+DROP INDEX CONCURRENTLY IF EXISTS rag_qa_vectors_embedding_hnsw_m24;
+DROP INDEX CONCURRENTLY IF EXISTS rag_vectors_sec_battles_hnsw_m24;
+DROP INDEX CONCURRENTLY IF EXISTS rag_vectors_sec_bosses_hnsw_m24;
+DROP INDEX CONCURRENTLY IF EXISTS rag_vectors_sec_champions_hnsw_m24;
+DROP INDEX CONCURRENTLY IF EXISTS rag_vectors_sec_gameplay_hnsw_m24;
+DROP INDEX CONCURRENTLY IF EXISTS rag_vectors_sec_locations_hnsw_m24;
+DROP INDEX CONCURRENTLY IF EXISTS rag_vectors_sec_mechanics_hnsw_m24;
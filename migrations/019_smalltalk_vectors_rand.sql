@@ -0,0 +1,11 @@
+-- Indexed random sort key for picking a random smalltalk topic.
+-- tools/db_rag_get_smalltalk.py takes the first row at or after a random point
+-- (`WHERE rand >= $r ORDER BY rand LIMIT 1`, wrapping around below it), one index probe
+-- instead of `ORDER BY RANDOM()` over the whole table.
+-- The volatile default gives every existing row its own value, new rows get one on insert.
+
+ALTER TABLE smalltalk_vectors
+    ADD COLUMN IF NOT EXISTS rand double precision NOT NULL DEFAULT random();
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS smalltalk_vectors_rand
+    ON smalltalk_vectors (rand);
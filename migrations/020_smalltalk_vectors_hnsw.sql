@@ -0,0 +1,11 @@
+-- HNSW indexes for the smalltalk similarity searches.
+-- tools/db_rag_get_smalltalk.py orders by `embedding <=> q` (query smalltalk) and takes the
+-- candidates of the proactive smalltalk search from both `embedding <=> q` and
+-- `topic_embedding <=> q`, each served by its own index instead of a full scan;
+-- similarity thresholds are applied to the returned top rows, so the index scans are not post-filtered.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS smalltalk_vectors_embedding_hnsw
+    ON smalltalk_vectors USING hnsw (embedding vector_cosine_ops);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS smalltalk_vectors_topic_embedding_hnsw
+    ON smalltalk_vectors USING hnsw (topic_embedding vector_cosine_ops);
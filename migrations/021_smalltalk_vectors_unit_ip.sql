@@ -0,0 +1,31 @@
+-- Unit-length smalltalk embeddings searched by inner product, like migration 018 for the RAG tables.
+-- tools/db_rag_get_smalltalk.py normalizes the query vector once and orders by `embedding <#> q`
+-- (and `topic_embedding <#> q`), skipping the per-candidate norm computation of `<=>`.
+-- A trigger keeps both embeddings normalized on write, the UPDATE fixes existing rows.
+-- The HNSW indexes from migration 020 are rebuilt with vector_ip_ops before those are dropped.
+
+CREATE OR REPLACE FUNCTION smalltalk_normalize_embeddings() RETURNS trigger AS $$
+BEGIN
+    NEW.embedding := l2_normalize(NEW.embedding);
+    NEW.topic_embedding := l2_normalize(NEW.topic_embedding);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS smalltalk_vectors_normalize_embeddings ON smalltalk_vectors;
+CREATE TRIGGER smalltalk_vectors_normalize_embeddings
+    BEFORE INSERT OR UPDATE OF embedding, topic_embedding ON smalltalk_vectors
+    FOR EACH ROW EXECUTE FUNCTION smalltalk_normalize_embeddings();
+
+UPDATE smalltalk_vectors
+SET embedding = l2_normalize(embedding), topic_embedding = l2_normalize(topic_embedding)
+WHERE abs(vector_norm(embedding) - 1) > 1e-3 OR abs(vector_norm(topic_embedding) - 1) > 1e-3;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS smalltalk_vectors_embedding_hnsw_ip
+    ON smalltalk_vectors USING hnsw (embedding vector_ip_ops);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS smalltalk_vectors_topic_embedding_hnsw_ip
+    ON smalltalk_vectors USING hnsw (topic_embedding vector_ip_ops);
+
+DROP INDEX CONCURRENTLY IF EXISTS smalltalk_vectors_embedding_hnsw;
+DROP INDEX CONCURRENTLY IF EXISTS smalltalk_vectors_topic_embedding_hnsw;
@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import Any, Callable
+from typing import Any, Callable, Optional
 
 from openai.types.chat import ChatCompletionToolParam
 from openai.types.shared_params.function_parameters import FunctionParameters
@@ -17,6 +17,8 @@ class T3RNTool:
     description: str
     system_prompt: str
     parameters: FunctionParameters
+    # Name of the argument the tool embeds as its RAG query, lets the agent batch the embeddings of one turn
+    embedding_arg: Optional[str] = None
 
     def __call__(self, *args: Any, **kwds: Any) -> dict | str:
         return self.function(*args, **kwds)
@@ -6,7 +6,7 @@ Compare two or more champions side by side with comprehensive analysis
 
 import logging
 
-from db_postgres import execute_query
+from db_postgres import execute_many_queries
 
 # Logger
 logger = logging.getLogger("ChampionsComparator")
@@ -56,23 +56,23 @@ def db_compare_champions(champion_names: list, detailed: bool = True) -> dict:
         champions = []
         not_found = []
 
-        # Find each champion using fuzzy search
-        for name in champion_names:
-            char_query = """
+        # Find each champion using fuzzy search, all lookups in one round-trip
+        char_query = """
             SELECT ct.id, ct.champion_name, ct.rarity, ct.affinity, ct.class, ct.faction,
                    ct.era, ct.fighting_style, ct.race, ct.side_of_force,
                    cs.attack, cs.defense, cs.health, cs.speed, cs.accuracy, cs.resistance,
                    cs.critical_rate, cs.critical_damage, cs.mana,
-                   (cs.attack + cs.defense + cs.health) as total_power
+                   cs.total_power
             FROM champion_traits ct
             JOIN champion_stats cs ON ct.champion_name = cs.champion_name
             WHERE ct.champion_name ILIKE %s
-            ORDER BY (cs.attack + cs.defense + cs.health) DESC
+            ORDER BY cs.total_power DESC
             LIMIT 1
             """
 
-            char_result = execute_query(char_query, (f"%{name}%",))
+        char_results = execute_many_queries([(char_query, (f"%{name}%",)) for name in champion_names])
 
+        for name, char_result in zip(champion_names, char_results):
             if char_result:
                 champion = char_result[0]
                 champions.append(champion)
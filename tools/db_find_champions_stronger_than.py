@@ -7,6 +7,7 @@ Find champions who have higher total power than a specified reference champion w
 import logging
 
 from db_postgres import execute_query
+from tools.db_get_champions_by_traits import trait_condition
 
 # Logger
 logger = logging.getLogger("ChampionsStrongerThan")
@@ -36,18 +37,52 @@ def db_find_champions_stronger_than(
         # Validate and cap limit
         limit = min(max(1, limit), 50)
 
-        # First, find the reference character
-        ref_query = """
-        SELECT ct.id, ct.champion_name, ct.rarity, ct.affinity, ct.class,
-               cs.attack, cs.defense, cs.health, 
-               (cs.attack + cs.defense + cs.health) as total_power
-        FROM champion_traits ct
-        JOIN champion_stats cs ON ct.champion_name = cs.champion_name
-        WHERE ct.champion_name ILIKE %s
-        LIMIT 1
+        # Build query conditions for stronger champions
+        conditions = ["cs2.total_power > ref.total_power"]
+        params = [f"%{character_name}%"]
+
+        # Add trait filtering if provided, unknown trait values match no champion
+        trait_columns = (("ct2.rarity", "rarity", rarity), ("ct2.affinity", "affinity", affinity), ("ct2.class", "class_type", class_type))
+        for column, category, value in trait_columns:
+            if value:
+                condition, condition_params = trait_condition(column, category, value)
+                conditions.append(condition)
+                params.extend(condition_params)
+
+        # Add limit parameter
+        params.append(limit)
+
+        # Find the reference character and the champions stronger than it in one round-trip,
+        # no row is returned if the reference character does not exist
+        query = f"""
+        WITH ref AS (
+            SELECT ct.id, ct.champion_name, ct.rarity, ct.affinity, ct.class,
+                   cs.attack, cs.defense, cs.health,
+                   cs.total_power
+            FROM champion_traits ct
+            JOIN champion_stats cs ON ct.champion_name = cs.champion_name
+            WHERE ct.champion_name ILIKE %s
+            LIMIT 1
+        )
+        SELECT row_to_json(ref) as ref_char,
+               COALESCE((
+                   SELECT json_agg(stronger)
+                   FROM (
+                       SELECT ct2.id, ct2.champion_name, ct2.rarity, ct2.affinity, ct2.class, ct2.faction,
+                              cs2.attack, cs2.defense, cs2.health, cs2.speed,
+                              cs2.total_power,
+                              (cs2.total_power - ref.total_power) as power_difference
+                       FROM champion_traits ct2
+                       JOIN champion_stats cs2 ON ct2.champion_name = cs2.champion_name
+                       WHERE {" AND ".join(conditions)}
+                       ORDER BY cs2.total_power DESC
+                       LIMIT %s
+                   ) stronger
+               ), '[]'::json) as stronger_chars
+        FROM ref
         """
 
-        ref_result = execute_query(ref_query, (f"%{character_name}%",))
+        ref_result = execute_query(query, params)
 
         if not ref_result:
             return {
@@ -82,45 +117,9 @@ def db_find_champions_stronger_than(
                 },
             }
 
-        ref_char = ref_result[0]
+        ref_char = ref_result[0]["ref_char"]
         ref_power = ref_char["total_power"]
-
-        # Build query conditions for stronger champions
-        conditions = ["(cs2.attack + cs2.defense + cs2.health) > %s"]
-        params = [ref_power]
-
-        # Add trait filtering if provided
-        if rarity:
-            conditions.append("ct2.rarity = %s")
-            params.append(rarity.upper())
-
-        if affinity:
-            conditions.append("ct2.affinity = %s")
-            params.append(affinity.upper())
-
-        if class_type:
-            conditions.append("ct2.class = %s")
-            params.append(class_type.upper())
-
-        # Add limit parameter
-        params.append(limit)
-
-        # Find champions stronger than the reference character
-        stronger_query = f"""
-        SELECT ct2.id, ct2.champion_name, ct2.rarity, ct2.affinity, ct2.class, ct2.faction,
-               cs2.attack, cs2.defense, cs2.health, cs2.speed,
-               (cs2.attack + cs2.defense + cs2.health) as total_power,
-               ((cs2.attack + cs2.defense + cs2.health) - %s) as power_difference
-        FROM champion_traits ct2
-        JOIN champion_stats cs2 ON ct2.champion_name = cs2.champion_name
-        WHERE {" AND ".join(conditions)}
-        ORDER BY total_power DESC
-        LIMIT %s
-        """
-
-        # Add ref_power again for power_difference calculation
-        query_params = [ref_power] + params
-        stronger_chars = execute_query(stronger_query, query_params)
+        stronger_chars = ref_result[0]["stronger_chars"]
 
         # Calculate power analysis if we have results
         power_analysis = {
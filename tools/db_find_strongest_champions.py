@@ -7,6 +7,7 @@ Find the strongest champions based on total power with optional trait filtering
 import logging
 
 from db_postgres import execute_query
+from tools.db_get_champions_by_traits import trait_condition
 
 # Logger
 logger = logging.getLogger("ChampComparator")
@@ -38,18 +39,13 @@ def db_find_strongest_champions(
         conditions = ["ct.champion_name IS NOT NULL"]
         params = []
 
-        # Add trait filtering if provided
-        if rarity:
-            conditions.append("ct.rarity = %s")
-            params.append(rarity.upper())
-
-        if affinity:
-            conditions.append("ct.affinity = %s")
-            params.append(affinity.upper())
-
-        if class_type:
-            conditions.append("ct.class = %s")
-            params.append(class_type.upper())
+        # Add trait filtering if provided, unknown trait values match no champion
+        trait_columns = (("ct.rarity", "rarity", rarity), ("ct.affinity", "affinity", affinity), ("ct.class", "class_type", class_type))
+        for column, category, value in trait_columns:
+            if value:
+                condition, condition_params = trait_condition(column, category, value)
+                conditions.append(condition)
+                params.extend(condition_params)
 
         # Add limit parameter
         params.append(limit)
@@ -58,7 +54,7 @@ def db_find_strongest_champions(
         query = f"""
         SELECT ct.id, ct.champion_name, ct.rarity, ct.affinity, ct.class, ct.faction,
                cs.attack, cs.defense, cs.health, cs.speed,
-               (cs.attack + cs.defense + cs.health) as total_power
+               cs.total_power
         FROM champion_traits ct
         JOIN champion_stats cs ON ct.champion_name = cs.champion_name
         WHERE {" AND ".join(conditions)}
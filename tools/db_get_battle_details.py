@@ -7,7 +7,7 @@ Retrieves detailed battle information from PostgreSQL database
 import logging
 
 # Import the global PostgreSQL connection
-from db_postgres import execute_query
+from db_postgres import execute_prepared
 
 # Logger
 logger = logging.getLogger("BattleDetails")
@@ -27,11 +27,12 @@ def db_get_battle_details(battle_name: str) -> dict:
         logger.info(f"Querying PostgreSQL for battle details: {battle_name}")
 
         # Search for battles by name (case insensitive)
-        results = execute_query(
+        results = execute_prepared(
+            "battle_details_by_name",
             """
             SELECT battle_id, battle_name, summary_text, summary_json
-            FROM battle_details 
-            WHERE LOWER(battle_name) LIKE LOWER(%s)
+            FROM battle_details
+            WHERE battle_name ILIKE $1
             ORDER BY battle_name
         """,
             (f"%{battle_name}%",),
@@ -7,7 +7,7 @@ Retrieves detailed champion information from PostgreSQL database
 import logging
 
 # Import the global PostgreSQL connection
-from db_postgres import execute_query
+from db_postgres import execute_prepared
 
 # Logger
 logger = logging.getLogger("Workload Tools")
@@ -27,11 +27,12 @@ def db_get_champion_details(champion_name: str) -> dict:
         logger.info(f"Querying PostgreSQL for champion details: {champion_name}")
 
         # Search for champions by name (case insensitive)
-        results = execute_query(
+        results = execute_prepared(
+            "champion_details_by_name",
             """
             SELECT champion_id, champion_name, summary_text, summary_json
-            FROM champion_details 
-            WHERE LOWER(champion_name) LIKE LOWER(%s)
+            FROM champion_details
+            WHERE champion_name ILIKE $1
             ORDER BY champion_name
         """,
             (f"%{champion_name}%",),
@@ -5,12 +5,106 @@ Find champions that match specified traits (rarity, affinity, class, etc.)
 """
 
 import logging
+import threading
+from typing import List, Tuple
 
-from db_postgres import execute_query
+from cachetools import TTLCache
+
+from db_postgres import execute_query_tuples
 
 # Logger
 logger = logging.getLogger("ChampionsByTraits")
 
+# Trait categories, values match the champion_traits enums (upper-cased)
+TRAIT_CATEGORIES = {
+    "rarity": ["legendary", "epic", "rare", "uncommon", "common"],
+    "affinity": ["red", "blue", "green", "yellow", "purple"],
+    "class_type": ["attacker", "defender", "support"],
+}
+
+# Reverse lookup: trait value -> category
+TRAIT_VALUE_CATEGORY = {value: category for category, values in TRAIT_CATEGORIES.items() for value in values}
+
+# Champion columns of the trait query, in SELECT order (followed by max/min/avg power)
+CHAMPION_COLUMNS = ("id", "champion_name", "rarity", "affinity", "class", "total_power")
+
+# Response text templates, the "other traits" notes are appended only when some traits were unrecognized
+NO_RESULTS_MESSAGE = "No champions found matching traits: {traits}"
+NO_RESULTS_LLM_INSTRUCTION = "No champions found matching the traits: {traits}. Suggest trying different trait combinations."
+NO_RESULTS_MESSAGE_OTHER_TRAITS = " For other traits like {other}, use other specialized functions."
+NO_RESULTS_LLM_OTHER_TRAITS = " For additional traits like {other}, consider using other search functions."
+SUMMARY = "Found {count} champions matching traits: {traits}. Strongest: {name} ({power} power)"
+SUMMARY_OTHER_TRAITS = " For other traits like {other}, use specialized functions."
+LLM_INSTRUCTION = "Present the list of {count} champions matching traits ({traits}):\n\n{formatted_list}\n\nHighlight that {name} is the strongest with {power} power."
+LLM_INSTRUCTION_OTHER_TRAITS = "\n\nFor additional traits like {other}, recommend using other specialized search functions."
+
+
+def trait_condition(column: str, category: str, value: str) -> Tuple[str, list]:
+    """
+    SQL condition and params filtering `column` by a trait value of the category.
+    Values outside the enum labels would fail the enum cast in Postgres ("invalid input value for enum"),
+    they match no champion instead.
+    """
+    if value.lower() in TRAIT_CATEGORIES[category]:
+        return f"{column} = %s", [value.upper()]
+    return "FALSE", []
+
+
+# Trait query results, champion data changes rarely
+traits_query_cache = TTLCache(maxsize=256, ttl=600)
+# Tools run on several threads, cachetools caches are not thread-safe
+traits_query_cache_lock = threading.Lock()
+
+
+def _query_champions_by_traits(trait_filters: dict, limit: int) -> List[tuple]:
+    """Run the trait query, memoized by the normalized trait filters and limit"""
+    cache_key = (tuple(sorted(trait_filters.items())), limit)
+    with traits_query_cache_lock:
+        rows = traits_query_cache.get(cache_key)
+    if rows is not None:
+        return rows
+
+    # Build dynamic query based on specified traits (at least one is always recognized)
+    query_conditions = []
+    query_params = []
+
+    for category, value in trait_filters.items():
+        if category == "class_type":
+            query_conditions.append("class = %s")
+        else:
+            query_conditions.append(f"{category} = %s")
+        query_params.append(value.upper())
+
+    # Add limit parameter
+    query_params.append(limit)
+
+    # TODO Illigal Querry building
+    # Power statistics are computed over the returned top rows in the same round-trip
+    query = f"""
+    WITH top_champions AS (
+        SELECT id, champion_name, rarity, affinity, class, total_power
+        FROM champion_search
+        WHERE {" AND ".join(query_conditions)}
+        ORDER BY total_power DESC
+        LIMIT %s
+    )
+    SELECT *,
+           MAX(total_power) OVER () as pw_max,
+           MIN(total_power) OVER () as pw_min,
+           (AVG(total_power) OVER ())::float8 as pw_avg
+    FROM top_champions
+    ORDER BY total_power DESC
+    """
+
+    rows = execute_query_tuples(query, query_params)
+
+    # Empty results are not cached, execute_query_tuples also returns [] on errors
+    if rows:
+        with traits_query_cache_lock:
+            traits_query_cache[cache_key] = rows
+
+    return rows
+
 
 def db_get_champions_by_traits(traits: list, limit: int = 50) -> dict:
     """
@@ -21,26 +115,19 @@ def db_get_champions_by_traits(traits: list, limit: int = 50) -> dict:
         limit: Maximum number of results to return (default: 50, max: 100)
 
     Returns:
-        str: JSON formatted list of champions matching the specified traits
+        dict: Champions matching the specified traits
     """
     try:
         # Validate and cap limit
         limit = min(max(1, limit), 100)
 
-        # Define trait categories
-        trait_categories = {
-            "rarity": ["legendary", "epic", "rare", "uncommon", "common"],
-            "affinity": ["red", "blue", "green", "yellow", "purple"],
-            "class_type": ["attacker", "defender", "support"],
-        }
-
         if not traits:
             return {
                 "status": "error",
                 "message": "At least one trait must be specified",
                 "traits": [],
                 "champions": [],
-                "available_traits": trait_categories,
+                "available_traits": TRAIT_CATEGORIES,
                 "internal_info": {"function_name": "db_get_champions_by_traits", "parameters": {"traits": traits, "limit": limit}},
             }
 
@@ -50,15 +137,11 @@ def db_get_champions_by_traits(traits: list, limit: int = 50) -> dict:
 
         for trait in traits:
             trait_lower = trait.lower()
-            found = False
+            category = TRAIT_VALUE_CATEGORY.get(trait_lower)
 
-            for category, values in trait_categories.items():
-                if trait_lower in values:
-                    trait_filters[category] = trait_lower  # Keep lowercase for internal logic
-                    found = True
-                    break
-
-            if not found:
+            if category:
+                trait_filters[category] = trait_lower  # Keep lowercase for internal logic
+            else:
                 unrecognized_traits.append(trait)
 
         # If no recognized traits, return error (this is a real error - invalid input)
@@ -68,47 +151,22 @@ def db_get_champions_by_traits(traits: list, limit: int = 50) -> dict:
                 "message": f"No recognized traits found. Unrecognized: {', '.join(unrecognized_traits)}",
                 "traits": traits,
                 "champions": [],
-                "available_traits": trait_categories,
+                "available_traits": TRAIT_CATEGORIES,
                 "internal_info": {"function_name": "db_get_champions_by_traits", "parameters": {"traits": traits, "limit": limit}},
             }
 
-        # Build dynamic query based on specified traits
-        query_conditions = ["ct.champion_name IS NOT NULL"]
-        query_params = []
+        rows = _query_champions_by_traits(trait_filters, limit)
 
-        for category, value in trait_filters.items():
-            if category == "class_type":
-                query_conditions.append("ct.class = %s")
-            else:
-                query_conditions.append(f"ct.{category} = %s")
-            query_params.append(value.upper())
-
-        # Add limit parameter
-        query_params.append(limit)
-
-        # TODO Illigal Querry building
-        query = f"""
-        SELECT ct.id, ct.champion_name, ct.rarity, ct.affinity, ct.class, 
-               ct.faction,
-               cs.attack, cs.defense, cs.health, cs.speed,
-               (cs.attack + cs.defense + cs.health) as total_power
-        FROM champion_traits ct
-        JOIN champion_stats cs ON ct.champion_name = cs.champion_name
-        WHERE {" AND ".join(query_conditions)}
-        ORDER BY total_power DESC
-        LIMIT %s
-        """
-
-        champions = execute_query(query, query_params)
+        recognized_traits = list(trait_filters.values())
+        text_fields = {"traits": ", ".join(recognized_traits), "other": ", ".join(unrecognized_traits)}
 
-        if not champions:
-            recognized_traits = list(trait_filters.values())
-            no_results_message = f"No champions found matching traits: {', '.join(recognized_traits)}"
-            llm_no_results = f"No champions found matching the traits: {', '.join(recognized_traits)}. Suggest trying different trait combinations."
+        if not rows:
+            no_results_message = NO_RESULTS_MESSAGE.format_map(text_fields)
+            llm_no_results = NO_RESULTS_LLM_INSTRUCTION.format_map(text_fields)
 
             if unrecognized_traits:
-                no_results_message += f" For other traits like {', '.join(unrecognized_traits)}, use other specialized functions."
-                llm_no_results += f" For additional traits like {', '.join(unrecognized_traits)}, consider using other search functions."
+                no_results_message += NO_RESULTS_MESSAGE_OTHER_TRAITS.format_map(text_fields)
+                llm_no_results += NO_RESULTS_LLM_OTHER_TRAITS.format_map(text_fields)
 
             return {
                 "status": "success",
@@ -123,47 +181,39 @@ def db_get_champions_by_traits(traits: list, limit: int = 50) -> dict:
                 "summary": no_results_message,
                 "formatted_list": "No champions found with the specified traits.",
                 "llm_instruction": llm_no_results,
-                "available_traits": trait_categories,
+                "available_traits": TRAIT_CATEGORIES,
                 "internal_info": {"function_name": "db_get_champions_by_traits", "parameters": {"traits": traits, "limit": limit}},
             }
 
-        # Calculate power statistics
-        powers = [c["total_power"] for c in champions]
-        highest_power = max(powers)
-        lowest_power = min(powers)
-        average_power = sum(powers) / len(powers)
-
-        strongest_champion = champions[0]  # Already sorted by total_power DESC
-
+        # Power statistics come from the window aggregates, identical on every row
+        highest_power, lowest_power, average_power = rows[0][6:9]
         power_stats = {"highest": highest_power, "lowest": lowest_power, "average": round(average_power, 1)}
 
-        # Create formatted list for LLM presentation
-        champion_list = []
-        for i, champion in enumerate(champions, 1):
-            champion_list.append(
-                f"{i}. **{champion['champion_name']}** - Power: {champion['total_power']} "
-                f"({champion.get('rarity', 'N/A')} {champion.get('affinity', 'N/A')} "
-                f"{champion.get('class', 'N/A')})"
-            )
+        # Build response dicts once, from the champion columns only
+        champions = [dict(zip(CHAMPION_COLUMNS, row[:6])) for row in rows]
 
-        formatted_list = "\n".join(champion_list)
+        strongest_champion = champions[0]  # Already sorted by total_power DESC
 
-        # Create summary
-        recognized_traits = list(trait_filters.values())
-        trait_list = ", ".join(recognized_traits)
-        summary = (
-            f"Found {len(champions)} champions matching traits: {trait_list}. "
-            f"Strongest: {strongest_champion['champion_name']} ({strongest_champion['total_power']} power)"
+        # Create formatted list for LLM presentation, straight from the row tuples
+        formatted_list = "\n".join(
+            f"{i}. **{name}** - Power: {power} ({rarity} {affinity} {class_type})"
+            for i, (_, name, rarity, affinity, class_type, power, *_) in enumerate(rows, 1)
         )
 
-        # Add note about other traits if any
-        if unrecognized_traits:
-            summary += f" For other traits like {', '.join(unrecognized_traits)}, use specialized functions."
+        # Create summary and LLM instruction
+        text_fields.update(
+            count=len(champions),
+            name=strongest_champion["champion_name"],
+            power=strongest_champion["total_power"],
+            formatted_list=formatted_list,
+        )
+        summary = SUMMARY.format_map(text_fields)
+        llm_instruction = LLM_INSTRUCTION.format_map(text_fields)
 
-        # Create LLM instruction
-        llm_instruction = f"Present the list of {len(champions)} champions matching traits ({trait_list}):\n\n{formatted_list}\n\nHighlight that {strongest_champion['champion_name']} is the strongest with {strongest_champion['total_power']} power."
+        # Add note about other traits if any
         if unrecognized_traits:
-            llm_instruction += f"\n\nFor additional traits like {', '.join(unrecognized_traits)}, recommend using other specialized search functions."
+            summary += SUMMARY_OTHER_TRAITS.format_map(text_fields)
+            llm_instruction += LLM_INSTRUCTION_OTHER_TRAITS.format_map(text_fields)
 
         return {
             "status": "success",
@@ -186,7 +236,7 @@ def db_get_champions_by_traits(traits: list, limit: int = 50) -> dict:
             "summary": summary,
             "formatted_list": formatted_list,
             "llm_instruction": llm_instruction,
-            "available_traits": trait_categories,
+            "available_traits": TRAIT_CATEGORIES,
             "internal_info": {"function_name": "db_get_champions_by_traits", "parameters": {"traits": traits, "limit": limit}},
         }
 
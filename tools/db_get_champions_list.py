@@ -5,6 +5,9 @@ Retrieves list of all champions from PostgreSQL database
 """
 
 import logging
+import threading
+
+from cachetools import TTLCache
 
 # Import the global PostgreSQL connection
 from db_postgres import execute_query
@@ -12,33 +15,44 @@ from db_postgres import execute_query
 # Logger
 logger = logging.getLogger("ChampionsList")
 
+# Champion names only change with a data import: the names and the joined prompt text are built once per ttl
+champions_list_cache = TTLCache(maxsize=2, ttl=600)
+# Tools run on several threads, cachetools caches are not thread-safe
+champions_list_cache_lock = threading.Lock()
+
 
 def db_get_champions_list() -> dict:
     """
     Get complete list of all available champions from PostgreSQL database
 
     Returns:
-        str: JSON formatted champions list response
+        dict: Champions list response
     """
     try:
-        logger.info("Querying PostgreSQL for champions list")
-
-        # Get all champion names from PostgreSQL
-        results = execute_query("""
-            SELECT champion_name 
-            FROM champions 
-            WHERE champion_name IS NOT NULL
-            ORDER BY champion_name
-        """)
-
-        if results:
-            # Extract champion names from results
+        with champions_list_cache_lock:
+            champions = champions_list_cache.get("champions")
+        if champions is None:
+            logger.info("Querying PostgreSQL for champions list")
+
+            # Get all champion names from PostgreSQL
+            results = execute_query("""
+                SELECT champion_name 
+                FROM champions 
+                WHERE champion_name IS NOT NULL
+                ORDER BY champion_name
+            """)
+
+            # Extract champion names from results, empty results are not cached (execute_query also returns [] on errors)
             champions = [result["champion_name"] for result in results]
+            if champions:
+                with champions_list_cache_lock:
+                    champions_list_cache["champions"] = champions
 
+        if champions:
             return {
                 "status": "success",
                 "message": f"Found {len(champions)} champions in database",
-                "champions": champions,
+                "champions": list(champions),
                 "internal_info": {
                     "function_name": "db_get_champions_list",
                     "parameters": {},
@@ -81,10 +95,18 @@ def db_get_champions_list_text() -> str:
         str: Comma-separated list of champion names
     """
     try:
+        with champions_list_cache_lock:
+            champions_text = champions_list_cache.get("text")
+        if champions_text is not None:
+            return champions_text
+
         result_dict = db_get_champions_list()
 
         if result_dict["status"] == "success":
-            return ", ".join(result_dict["champions"])
+            champions_text = ", ".join(result_dict["champions"])
+            with champions_list_cache_lock:
+                champions_list_cache["text"] = champions_text
+            return champions_text
         else:
             return "Champions list not available"
     except Exception as e:
@@ -27,6 +27,37 @@ def _create_error_response(action: str, message: str, error_details: str, champi
     }
 
 
+def _format_report(champion_name: str, lore_text: str) -> str:
+    """Format the champion lore report shown to the user"""
+    return f"""# CHAMPION LORE REPORT
+
+**Champion:** {champion_name}
+
+{lore_text}
+
+---
+*Report generated from Mandalorian Archives - Report Database*"""
+
+
+def _create_success_response(result: dict, champion_name: str) -> dict:
+    """Helper function to create the report response for a lore record"""
+    return {
+        "status": "success",
+        "action": "DISPLAY_REPORT_FINAL",
+        "message": "Champion lore report retrieved successfully",
+        "report_data": {
+            "champion_name": result["champion_name"],
+            "champion_id": result["champion_id"],
+            "formatted_report": _format_report(result["champion_name"], result["lore_text"]),
+        },
+        "llm_cache_duration": 3,
+        "internal_info": {
+            "function_name": "db_get_lore_details",
+            "parameters": {"champion_name": champion_name},
+        },
+    }
+
+
 def db_get_lore_details(champion_name: str) -> dict:
     """
     Get champion lore report from the lore database
@@ -35,50 +66,33 @@ def db_get_lore_details(champion_name: str) -> dict:
         champion_name (str): Name of the champion to get lore for (case insensitive)
 
     Returns:
-        Formatted string with champion lore report
+        dict: Champion lore report response
     """
     try:
         logger.info(f"Querying PostgreSQL for lore details: {champion_name}")
 
-        # Search for champion by name (case insensitive)
+        # Search for champion by name (case insensitive): exact match on the stored lowercase name first,
+        # substring match only if the exact branch returns nothing (Append + LIMIT stops at the first row)
         results = execute_query(
             """
-            SELECT champion_id, champion_name, lore_text 
-            FROM lore_records 
-            WHERE LOWER(champion_name) LIKE LOWER(%s)
+            (SELECT champion_id, champion_name, lore_text
+             FROM lore_records
+             WHERE champion_name_lc = %s
+             LIMIT 1)
+            UNION ALL
+            (SELECT champion_id, champion_name, lore_text
+             FROM lore_records
+             WHERE champion_name ILIKE %s
+             LIMIT 1)
+            LIMIT 1
         """,
-            (f"%{champion_name}%",),
+            (champion_name.lower(), f"%{champion_name}%"),
         )
 
         result = results[0] if results else None
 
         if result:
-            # Format the lore report as a string (result is already a dictionary)
-            report = f"""# CHAMPION LORE REPORT
-
-**Champion:** {result["champion_name"]}
-
-{result["lore_text"]}
-
----
-*Report generated from Mandalorian Archives - Report Database*"""
-
-            # Return JSON with report data and instruction for LLM
-            return {
-                "status": "success",
-                "action": "DISPLAY_REPORT_FINAL",
-                "message": "Champion lore report retrieved successfully",
-                "report_data": {
-                    "champion_name": result["champion_name"],
-                    "champion_id": result["champion_id"],
-                    "formatted_report": report,
-                },
-                "llm_cache_duration": 3,
-                "internal_info": {
-                    "function_name": "db_get_lore_details",
-                    "parameters": {"champion_name": champion_name},
-                },
-            }
+            return _create_success_response(result, champion_name)
         else:
             return _create_error_response(
                 "REPORT_NOT_FOUND",
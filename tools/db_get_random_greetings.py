@@ -18,7 +18,7 @@ def db_get_random_greetings() -> dict:
     Get a random greeting from the greetings database (OpenAI Function Calling format)
 
     Returns:
-        str: JSON formatted greeting response
+        dict: Greeting response
     """
     try:
         logger.info("Querying PostgreSQL for random greeting")
@@ -1,154 +1,375 @@
 import logging
 import random
-from typing import Any, Dict, List, Optional
+import re
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from typing import Any, Dict, Hashable, List, Optional, Tuple
 
 import numpy as np
-from cachetools import LRUCache, cached
+from cachetools import LRUCache, TTLCache, cached
 from openai.types.chat import ChatCompletionMessageParam
+from psycopg2.extensions import adapt
 
-from db_postgres import execute_query
-from embedder import embd
+from db_postgres import execute_prepared, execute_query
+from embedder import embd, embd_batch
 
 # Constants
 DEFAULT_RAG_SIMILARITY_THRESHOLD = 0.4
 DEFAULT_RAG_SIMILARITY_LIMIT = 4
+MIN_HNSW_EF_SEARCH = 40
+TRIGRAM_PREFILTER_CANDIDATES = 200
+# Queries up to this many words are first looked up as an exact entity name
+MAX_ENTITY_NAME_WORDS = 4
+SEMANTIC_CACHE_SIZE = 256
+SEMANTIC_CACHE_SIMILARITY = 0.97
+SEMANTIC_CACHE_TTL = 600
+# chunk_section values searched by the tools/db_rag_get_*.py tools (None: general knowledge, all sections)
+RAG_SECTIONS = ("BATTLES", "BOSSES", "CHAMPIONS", "GAMEPLAY", "LOCATIONS", "MECHANICS", None)
 
 # Logger
 logger = logging.getLogger("DB RAG Common")
 
-query_embedding_cache = LRUCache(maxsize=1024)
+# RAG tools may run concurrently (e.g. getChampionsDetails), cachetools caches are not thread-safe.
+# One lock guards every cache access in this module, it is never held during an embedding or a query.
+cache_lock = threading.Lock()
+
+
+class TinyLFUCache(MutableMapping):
+    """
+    LRU cache with TinyLFU admission: once full, a new key only replaces the least recently used
+    entry if it has been requested at least as often as that entry, so one-shot queries do not evict
+    the hot working set. Request counts are halved every `sample_size` requests to age them.
+    Drop-in for cachetools caches (`@cached`, `.get`), not thread-safe on its own.
+    Only lookups (`cache[key]`, `.get`) count as requests, `in` and `.setdefault` (used by `@cached`
+    to store a computed miss) do not, so every miss is counted once.
+    """
+
+    def __init__(self, maxsize: int, sample_size: Optional[int] = None):
+        self.maxsize = maxsize
+        self.sample_size = sample_size or 10 * maxsize
+        self._data: OrderedDict = OrderedDict()
+        self._frequency: Dict[Hashable, int] = {}
+        self._requests = 0
+
+    def _record_request(self, key: Hashable):
+        self._frequency[key] = self._frequency.get(key, 0) + 1
+        self._requests += 1
+        if self._requests >= self.sample_size:
+            self._frequency = {k: count // 2 for k, count in self._frequency.items() if count > 1}
+            self._requests //= 2
+
+    def __getitem__(self, key: Hashable) -> Any:
+        self._record_request(key)
+        value = self._data[key]
+        self._data.move_to_end(key)
+        return value
+
+    def __setitem__(self, key: Hashable, value: Any):
+        if key not in self._data and len(self._data) >= self.maxsize:
+            victim = next(iter(self._data))
+            if self._frequency.get(key, 0) < self._frequency.get(victim, 0):
+                return
+            del self._data[victim]
+
+        self._data[key] = value
+        self._data.move_to_end(key)
+
+    def __delitem__(self, key: Hashable):
+        del self._data[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
+
+    def setdefault(self, key: Hashable, default: Any = None) -> Any:
+        if key in self._data:
+            return self._data[key]
+        self[key] = default
+        return default
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+query_embedding_cache = LRUCache(maxsize=2048)
+query_embedding_cache_stats = {"hits": 0, "misses": 0}
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
 
 
-@cached(cache=query_embedding_cache)
 def generate_query_embedding(query: str) -> Optional[List[float]]:
+    """Embedding of the query, memoized by the normalized query (failed embeddings are not cached)"""
+    normalized_query = normalize_query(query)
+    with cache_lock:
+        embedding = query_embedding_cache.get(normalized_query)
+        query_embedding_cache_stats["hits" if embedding is not None else "misses"] += 1
+    if embedding is not None:
+        return embedding
+
+    logger.debug("Query embedding cache miss (%(hits)d hits / %(misses)d misses)", query_embedding_cache_stats)
+
     try:
+        # Only the cache key is normalized, the embedding is of the query as written (case matters for names)
         embedding = embd(query)
-        return embedding
     except Exception as e:
         logger.error(f"Error generating embedding: {str(e)}")
         return None
 
+    if embedding:
+        with cache_lock:
+            query_embedding_cache[normalized_query] = embedding
+    return embedding
+
+
+def prefetch_query_embeddings(queries: List[str]) -> None:
+    """
+    Embed several queries with one batched Ollama request and seed the query embedding cache,
+    so the tools of one agent turn get their embeddings from generate_query_embedding without a round-trip each
+    """
+    # Normalized query (cache key) -> first query with that key, embedded as written like in generate_query_embedding
+    missing: Dict[str, str] = {}
+    with cache_lock:
+        for query in queries:
+            normalized_query = normalize_query(query)
+            if normalized_query and normalized_query not in query_embedding_cache:
+                missing.setdefault(normalized_query, query)
+
+    # A single missing query is embedded by generate_query_embedding as usual
+    if len(missing) < 2:
+        return
+
+    embeddings = embd_batch(list(missing.values()))
+    if not embeddings or len(embeddings) != len(missing):
+        return
+
+    with cache_lock:
+        for normalized_query, embedding in zip(missing, embeddings):
+            if embedding:
+                query_embedding_cache[normalized_query] = embedding
+
+
+def to_vector_literal(embedding) -> str:
+    """
+    pgvector text literal ('[x,y,...]') for an embedding (list or ndarray), bound as one string parameter.
+    An already converted literal is returned as is, so callers running several searches
+    with the same embedding can convert it once and pass the literal around.
+    """
+    if isinstance(embedding, str):
+        return embedding
+    return "[" + ",".join(map(str, embedding)) + "]"
+
+
+def parse_vector(vector_text: str) -> np.ndarray:
+    """float32 array from a pgvector text value ('[x,y,...]'), parsed in one C loop"""
+    return np.fromstring(vector_text[1:-1], dtype=np.float32, sep=",")
+
+
+CONVERSATION_EMBEDDING_ROLES = frozenset(("user", "assistant"))
+
 
 def generate_embedding_from_conv(
     conversation: List["ChatCompletionMessageParam"],
 ) -> Optional[List[float]]:
-    messages = []
-    for message in conversation:
-        if message["role"] in ["user", "assistant"]:
-            messages.append(message)
+    # Filter and format in a single pass over the conversation
+    combined_text = "\n".join(f"{msg['role']}: {msg['content']}" for msg in conversation if msg["role"] in CONVERSATION_EMBEDDING_ROLES)
 
-    if not messages:
+    if not combined_text:
         return None
 
-    combined_text = "\n".join(f"{msg['role']}: {msg['content']}" for msg in messages)
-
     return embd(combined_text)
 
 
-rag_search_cache = LRUCache(maxsize=512)
+rag_search_cache = TinyLFUCache(maxsize=512)
 
 
-# TODO query_embedding should have EPS for cache.
-@cached(
-    cache=rag_search_cache,
-    key=lambda query_embedding, chunk_section, search_qa, threshold, limit: (
-        tuple(query_embedding),
-        chunk_section,
-        search_qa,
-        threshold,
-        limit,
-    ),
-)
+def _rag_search_key(
+    query: str,
+    chunk_section: str | None = None,
+    include_qa: bool = True,
+    threshold: float = DEFAULT_RAG_SIMILARITY_THRESHOLD,
+    limit: int = DEFAULT_RAG_SIMILARITY_LIMIT,
+    ef_search: Optional[int] = None,
+) -> tuple:
+    # Keyed by the normalized query text (the embedding is memoized by the same key),
+    # a probe hashes one string instead of a tuple of every embedding dimension
+    return normalize_query(query), chunk_section, include_qa, threshold, limit, ef_search
+
+
+@cached(cache=rag_search_cache, lock=cache_lock, key=_rag_search_key)
 def execute_rag_search(
-    query_embedding: List[float],
+    query: str,
     chunk_section: str | None = None,
-    search_qa: bool = False,
+    include_qa: bool = True,
     threshold: float = DEFAULT_RAG_SIMILARITY_THRESHOLD,
     limit: int = DEFAULT_RAG_SIMILARITY_LIMIT,
-) -> List[Dict[str, Any]]:
+    ef_search: Optional[int] = None,
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
     """
-    Execute RAG similarity search in PostgreSQL
+    Execute RAG similarity search in PostgreSQL, non-QA and QA content in a single round-trip
+    (the QA search follows separately when the trigram cascade of an unfiltered search is kept)
 
     Args:
-        query_embedding: Vector embedding for the query
+        query: Search query string, embedded with the memoized generate_query_embedding
         chunk_section: The chunk_section to filter by (e.g., 'LOCATIONS', 'CHAMPIONS'). If None, search all sections.
-        search_qa: If True, search for QA content in rag_qa_vectors; if False, search for non-QA content in rag_vectors
+        include_qa: If True, also search QA content in rag_qa_vectors
         threshold: Minimum similarity threshold
-        limit: Maximum number of results
+        limit: Maximum number of results (per kind)
+        ef_search: HNSW candidate list size (recall vs. speed), default scales with the limit
 
     Returns:
-        List of dictionaries with chunk_text, metadata, and similarity
+        Tuple of (similarity results from rag_vectors, QA results from rag_qa_vectors),
+        lists of dictionaries with chunk_text, entity_name, and similarity
     """
     try:
-        if search_qa:
-            if chunk_section:
-                # Search for QA results in separate rag_qa_vectors table
-                # Use entity_names from the corresponding chunk_section in main table
-                query = """
-                    SELECT qa.chunk_text, qa.metadata, 1 - (qa.embedding <=> %s::vector) as similarity
-                    FROM rag_qa_vectors qa
-                    WHERE qa.metadata->>'entity_name' IN (
-                        SELECT DISTINCT metadata->>'entity_name' 
-                        FROM rag_vectors 
-                        WHERE metadata->>'chunk_section' = %s
-                    )
-                    AND 1 - (qa.embedding <=> %s::vector) >= %s
-                    ORDER BY similarity DESC
-                    LIMIT %s
-                """
-                params = (
-                    query_embedding,
-                    chunk_section,
-                    query_embedding,
-                    threshold,
-                    limit,
-                )
-            else:
-                # Search all QA results without chunk_section filter
-                query = """
-                    SELECT chunk_text, metadata, 1 - (embedding <=> %s::vector) as similarity
-                    FROM rag_qa_vectors
-                    WHERE 1 - (embedding <=> %s::vector) >= %s
-                    ORDER BY similarity DESC
-                    LIMIT %s
-                """
-                params = (query_embedding, query_embedding, threshold, limit)
-        else:
-            if chunk_section:
-                # Search for similarity results (non-QA) in main rag_vectors table with chunk_section filter
-                query = """
-                    SELECT chunk_text, metadata, 1 - (embedding <=> %s::vector) as similarity
-                    FROM rag_vectors 
-                    WHERE metadata->>'chunk_section' = %s
-                    AND NOT (metadata->>'chunk_name' LIKE '%%QA%%')
-                    AND 1 - (embedding <=> %s::vector) >= %s
-                    ORDER BY similarity DESC
-                    LIMIT %s
-                """
-                params = (
-                    query_embedding,
-                    chunk_section,
-                    query_embedding,
-                    threshold,
-                    limit,
+        query_embedding = generate_query_embedding(query)
+        if not query_embedding:
+            return [], []
+
+        # The query embedding is sent as a single vector literal and cast once, both searches read it from the CTE
+        # (a plain list would be adapted to an ARRAY[...] expression with one constant per dimension)
+        params = (to_vector_literal(query_embedding), limit)
+
+        # HNSW candidate list (scaled with the limit unless given), SET LOCAL only lasts for this statement's implicit transaction
+        preamble = f"SET LOCAL hnsw.ef_search = {int(ef_search or max(MIN_HNSW_EF_SEARCH, 4 * limit))};"
+
+        if chunk_section is None:
+            # Unfiltered searches walk the whole HNSW graph, try a cascade first: trigram prefilter on the chunk text
+            # (GIN index, migration 015), exact vector rerank of those few candidates. Kept only when `limit` of them
+            # pass the threshold, otherwise falls back to the ANN search (e.g. the query is worded unlike the chunks,
+            # or the lexical matches are semantically weak). The cascade only searches the chunks, QA rows are
+            # searched once: by the QA search after a cascade hit, or by the ANN statement on fallback.
+            results = execute_prepared(
+                _rag_search_statement_name(chunk_section, include_qa=False, prefilter=True),
+                _rag_search_query(chunk_section, include_qa=False, prefilter=True),
+                params + (normalize_query(query),),
+                preamble,
+            )
+            similarity_results, _ = _split_rag_results(results, threshold)
+            if len(similarity_results) >= limit:
+                if not include_qa:
+                    return similarity_results, []
+                results = execute_prepared(
+                    _rag_qa_search_statement_name(chunk_section),
+                    _rag_qa_search_query(chunk_section),
+                    params,
+                    preamble,
                 )
-            else:
-                # Search all similarity results without chunk_section filter
-                query = """
-                    SELECT chunk_text, metadata, 1 - (embedding <=> %s::vector) as similarity
-                    FROM rag_vectors 
-                    WHERE NOT (metadata->>'chunk_name' LIKE '%%QA%%')
-                    AND 1 - (embedding <=> %s::vector) >= %s
-                    ORDER BY similarity DESC
-                    LIMIT %s
-                """
-                params = (query_embedding, query_embedding, threshold, limit)
-
-        return execute_query(query, params)
+                _, qa_results = _split_rag_results(results, threshold)
+                return similarity_results, qa_results
+
+        results = execute_prepared(
+            _rag_search_statement_name(chunk_section, include_qa),
+            _rag_search_query(chunk_section, include_qa),
+            params,
+            preamble,
+        )
+        return _split_rag_results(results, threshold)
 
     except Exception as e:
         logger.error(f"Error in RAG search: {str(e)}")
-        return []
+        return [], []
+
+
+def _split_rag_results(results: List[Dict[str, Any]], threshold: float) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    (similarity results, QA results) of a RAG search above the threshold. The threshold is applied to the top `limit` rows
+    here: rows come ordered by distance, so this keeps exactly the rows a SQL threshold filter would have returned
+    """
+    similarity_results = [row for row in results if row["kind"] == "sim" and row["similarity"] >= threshold]
+    qa_results = [row for row in results if row["kind"] == "qa" and row["similarity"] >= threshold]
+    return similarity_results, qa_results
+
+
+def _rag_search_statement_name(chunk_section: str | None, include_qa: bool, prefilter: bool = False) -> str:
+    """Prepared statement name of the RAG search, one per (chunk_section, include_qa, prefilter)"""
+    section = re.sub(r"\W", "_", chunk_section.lower()) if chunk_section else "all"
+    if prefilter:
+        section += "_trgm"
+    return f"rag_search_{section}_qa" if include_qa else f"rag_search_{section}"
+
+
+def _rag_qa_search_statement_name(chunk_section: str | None) -> str:
+    """Prepared statement name of the QA-only RAG search, one per chunk_section"""
+    section = re.sub(r"\W", "_", chunk_section.lower()) if chunk_section else "all"
+    return f"rag_qa_search_{section}"
+
+
+def _rag_search_query(chunk_section: str | None, include_qa: bool, prefilter: bool = False) -> str:
+    """
+    RAG search SQL for execute_prepared: $1 query embedding literal, $2 limit (per kind),
+    with prefilter also $3 query text.
+
+    The chunk_section is inlined as a constant (each section has its own prepared statement),
+    so even the generic plan can use that section's partial HNSW index (migration 011).
+    Ordering by the distance itself (not by the similarity alias) lets the planner use the HNSW index,
+    the similarity threshold is applied by the caller so the index scan is not post-filtered on the distance.
+    Only entity_name is read instead of the whole metadata JSONB, so no per-row JSON decoding.
+    Embeddings are stored as halfvec (migration 012), the query vector is cast to match.
+    Stored embeddings are unit length (migration 018) and the query vector is normalized once in the CTE,
+    so the cosine similarity is the negated inner product `<#>` (served by the halfvec_ip_ops HNSW indexes).
+    With prefilter the similarity results are reranked from the TRIGRAM_PREFILTER_CANDIDATES chunks
+    whose text best contains the query words (`<%` word similarity, trigram GIN index) instead of the HNSW index,
+    the caller runs it without include_qa.
+    """
+    section = adapt(chunk_section).getquoted().decode("utf-8") if chunk_section else None
+
+    # Similarity results (non-QA) in main rag_vectors table
+    section_filter = f"chunk_section = {section} AND " if section else ""
+    if prefilter:
+        query = f"""
+            WITH q AS (SELECT l2_normalize($1::halfvec) AS v),
+            candidates AS (
+                SELECT chunk_text, entity_name, embedding
+                FROM rag_vectors
+                WHERE {section_filter}NOT is_qa AND $3 <% chunk_text
+                ORDER BY word_similarity($3, chunk_text) DESC
+                LIMIT {TRIGRAM_PREFILTER_CANDIDATES}
+            )
+            (SELECT 'sim' AS kind, chunk_text, entity_name, -(embedding <#> (SELECT v FROM q)) as similarity
+             FROM candidates
+             ORDER BY embedding <#> (SELECT v FROM q)
+             LIMIT $2)
+        """
+    else:
+        query = f"""
+            WITH q AS (SELECT l2_normalize($1::halfvec) AS v)
+            (SELECT 'sim' AS kind, chunk_text, entity_name, -(embedding <#> (SELECT v FROM q)) as similarity
+             FROM rag_vectors
+             WHERE {section_filter}NOT is_qa
+             ORDER BY embedding <#> (SELECT v FROM q)
+             LIMIT $2)
+        """
+
+    if include_qa:
+        query += "UNION ALL" + _rag_qa_search_branch(section)
+
+    return query
+
+
+def _rag_qa_search_query(chunk_section: str | None) -> str:
+    """QA-only RAG search SQL for execute_prepared ($1 query embedding literal, $2 limit), run after a prefilter hit"""
+    section = adapt(chunk_section).getquoted().decode("utf-8") if chunk_section else None
+    return "WITH q AS (SELECT l2_normalize($1::halfvec) AS v)" + _rag_qa_search_branch(section)
+
+
+def _rag_qa_search_branch(section: str | None) -> str:
+    """QA part of the RAG search SQL (reads the query vector from the `q` CTE), `section` is a quoted SQL literal or None"""
+    # QA results in separate rag_qa_vectors table,
+    # limited to entity_names of the chunk_section (entity_sections materialized view)
+    qa_join = f"JOIN entity_sections es ON es.entity_name = qa.entity_name AND es.chunk_section = {section}" if section else ""
+    return f"""
+            (SELECT 'qa' AS kind, qa.chunk_text, qa.entity_name, -(qa.embedding <#> (SELECT v FROM q)) as similarity
+             FROM rag_qa_vectors qa
+             {qa_join}
+             ORDER BY qa.embedding <#> (SELECT v FROM q)
+             LIMIT $2)
+            """
 
 
 def process_rag_results(results: List[Dict[str, Any]], is_qa: bool = False, random_selection: bool = False) -> str:
@@ -166,40 +387,85 @@ def process_rag_results(results: List[Dict[str, Any]], is_qa: bool = False, rand
     if not results:
         return ""
 
-    # Convert results to standard format
-    processed_results = []
-    for row in results:
-        chunk_text = row["chunk_text"]
-        metadata = row["metadata"]
-        similarity_score = row["similarity"]
-        processed_results.append(
-            {
-                "content": chunk_text,
-                "metadata": metadata,
-                "similarity": float(similarity_score),
-            }
-        )
+    # Handle random selection (for smalltalk) vs all results (for RAG), rows are used as returned
+    if random_selection:
+        # Single random result (for smalltalk), only the selected row is formatted
+        selected_row = results[random.randrange(len(results))]
+        name = selected_row["entity_name"] or "unknown"
+        prefix = "### Q&A: " if is_qa else "### "
+        return f"{prefix}{name}\n{selected_row['chunk_text']}"
+    else:
+        # All results as text (for RAG)
+        return "\n\n".join(row["chunk_text"] for row in results)
 
-    if not processed_results:
-        return ""
 
-    # Handle random selection (for smalltalk) vs all results (for RAG)
-    if random_selection:
-        # Single random result (for smalltalk)
-        selected_result = random.choice(processed_results)
-        name = selected_result["metadata"].get("entity_name", "unknown") if selected_result["metadata"] else "unknown"
+class SemanticCache:
+    """
+    Cache keyed by query embeddings: a lookup hits when a stored embedding is at least
+    `similarity` cosine-similar to the queried one. Embeddings are kept L2-normalized
+    in one float32 ring buffer, so a lookup is a single matrix-vector product.
+    Entries expire `ttl` seconds after they were stored.
+    """
 
-        if is_qa:
-            return f"### Q&A: {name}\n{selected_result['content']}"
+    def __init__(self, maxsize: int = SEMANTIC_CACHE_SIZE, similarity: float = SEMANTIC_CACHE_SIMILARITY, ttl: float = SEMANTIC_CACHE_TTL):
+        self.maxsize = maxsize
+        self.similarity = similarity
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._embeddings: Optional[np.ndarray] = None
+        self._stored_at = np.zeros(maxsize, dtype=np.float64)
+        self._values: List[Any] = []
+        self._next = 0
+
+    @staticmethod
+    def _normalize(embedding) -> Optional[np.ndarray]:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else None
+
+    def get(self, embedding) -> Any:
+        vector = self._normalize(embedding)
+        if vector is None or self._embeddings is None or not self._values:
+            self.misses += 1
+            return None
+
+        count = len(self._values)
+        scores = self._embeddings[:count] @ vector
+        # Expired entries never match, they are overwritten in ring order like any other
+        scores[self._stored_at[:count] < time.monotonic() - self.ttl] = -1.0
+        best = int(np.argmax(scores))
+        if scores[best] < self.similarity:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return self._values[best]
+
+    def put(self, embedding, value: Any):
+        vector = self._normalize(embedding)
+        if vector is None:
+            return
+
+        if self._embeddings is None:
+            self._embeddings = np.empty((self.maxsize, vector.shape[0]), dtype=np.float32)
+
+        # Oldest entry is overwritten once the buffer is full
+        self._embeddings[self._next] = vector
+        self._stored_at[self._next] = time.monotonic()
+        if len(self._values) < self.maxsize:
+            self._values.append(value)
         else:
-            return f"### {name}\n{selected_result['content']}"
-    else:
-        # All results as text (for RAG)
-        content_parts = []
-        for result in processed_results:
-            content_parts.append(result["content"])
+            self._values[self._next] = value
+        self._next = (self._next + 1) % self.maxsize
 
-        return "\n\n".join(content_parts)
+
+# Universal RAG contents (similarity_content, qa_content):
+# exact hits by normalized query text, semantic hits by query embedding (one cache per search parameters)
+rag_contents_cache = TinyLFUCache(maxsize=1024)
+rag_semantic_caches: Dict[tuple, SemanticCache] = {}
+# Entity names per chunk_section for the exact entity lookup, names only change with a RAG ingestion
+section_entity_names_cache = TTLCache(maxsize=len(RAG_SECTIONS), ttl=600)
 
 
 def create_rag_response(
@@ -263,6 +529,95 @@ def create_rag_response(
     return response
 
 
+def _search_rag_contents(
+    query: str,
+    chunk_section: str | None,
+    threshold: float,
+    limit: int,
+    include_qa: bool,
+    ef_search: Optional[int] = None,
+) -> Tuple[str, str]:
+    """Run the similarity (and QA) searches, returns formatted (similarity_content, qa_content)"""
+    similarity_results, qa_results = execute_rag_search(
+        query=query,
+        chunk_section=chunk_section,
+        include_qa=include_qa,
+        threshold=threshold,
+        limit=limit,
+        ef_search=ef_search,
+    )
+
+    similarity_content = process_rag_results(similarity_results, is_qa=False, random_selection=False)
+    qa_content = process_rag_results(qa_results, is_qa=True, random_selection=False)
+
+    return similarity_content, qa_content
+
+
+def _section_entity_names(chunk_section: str) -> frozenset:
+    """Normalized entity names of the chunk_section (entity_sections materialized view), loaded once per ttl"""
+    with cache_lock:
+        names = section_entity_names_cache.get(chunk_section)
+    if names is not None:
+        return names
+
+    rows = execute_query("SELECT entity_name FROM entity_sections WHERE chunk_section = %s", (chunk_section,))
+    names = frozenset(normalize_query(row["entity_name"]) for row in rows)
+    # Empty names are not cached, execute_query also returns [] on errors
+    if names:
+        with cache_lock:
+            section_entity_names_cache[chunk_section] = names
+    return names
+
+
+def _exact_entity_contents(query: str, chunk_section: str, limit: int, include_qa: bool) -> Optional[Tuple[str, str]]:
+    """
+    Formatted (similarity_content, qa_content) of the entity named exactly (case-insensitive) by the query,
+    None if no chunk of the section has that entity_name. Names are a small bounded set kept in memory, so other
+    queries cost no lookup; a hit skips the ANN search (lower(entity_name) indexes, migration 016) and ranks
+    the entity's chunks by distance to the query embedding, the same embedding the ANN search would use.
+    """
+    normalized_query = normalize_query(query)
+    if normalized_query not in _section_entity_names(chunk_section):
+        return None
+
+    query_embedding = generate_query_embedding(query)
+    if not query_embedding:
+        return None
+
+    section = adapt(chunk_section).getquoted().decode("utf-8")
+    statement_name = _rag_search_statement_name(chunk_section, include_qa).replace("rag_search_", "rag_entity_", 1)
+
+    query_sql = f"""
+        WITH q AS (SELECT l2_normalize($3::halfvec) AS v)
+        (SELECT 'sim' AS kind, chunk_text
+         FROM rag_vectors
+         WHERE lower(entity_name) = $1 AND chunk_section = {section} AND NOT is_qa
+         ORDER BY embedding <#> (SELECT v FROM q)
+         LIMIT $2)
+    """
+    if include_qa:
+        query_sql += """
+        UNION ALL
+        (SELECT 'qa' AS kind, chunk_text
+         FROM rag_qa_vectors
+         WHERE lower(entity_name) = $1
+         ORDER BY embedding <#> (SELECT v FROM q)
+         LIMIT $2)
+        """
+
+    results = execute_prepared(statement_name, query_sql, (normalized_query, limit, to_vector_literal(query_embedding)))
+
+    similarity_results = [row for row in results if row["kind"] == "sim"]
+    if not similarity_results:
+        return None
+
+    qa_results = [row for row in results if row["kind"] == "qa"]
+    return (
+        process_rag_results(similarity_results, is_qa=False, random_selection=False),
+        process_rag_results(qa_results, is_qa=True, random_selection=False),
+    )
+
+
 def execute_universal_rag(
     query: str,
     chunk_section: str | None = None,
@@ -271,6 +626,7 @@ def execute_universal_rag(
     threshold: float = DEFAULT_RAG_SIMILARITY_THRESHOLD,
     limit: int = DEFAULT_RAG_SIMILARITY_LIMIT,
     include_qa: bool = True,
+    ef_search: Optional[int] = None,
 ) -> dict:
     """
     Universal RAG function that handles the complete RAG workflow
@@ -283,43 +639,65 @@ def execute_universal_rag(
         threshold: Similarity threshold
         limit: Result limit
         include_qa: Whether to search for QA results separately
+        ef_search: HNSW candidate list size for this category's searches, default scales with the limit
 
     Returns:
         JSON formatted response string
     """
-    try:
-        # Generate embedding
-        query_embedding = generate_query_embedding(query)
-        if not query_embedding:
-            return create_rag_response(
-                query=query,
-                category=category,
-                function_name=function_name,
-                error_message=f"Failed to generate embedding for query '{query}'",
-            )
-
-        # Search for similarity results
-        similarity_results = execute_rag_search(
-            query_embedding=query_embedding,
-            chunk_section=chunk_section,
-            search_qa=False,
-            threshold=threshold,
-            limit=limit,
+    # Degenerate queries (empty, a single character, only punctuation) can't match anything useful,
+    # answered right away without an embedding request or a search
+    stripped_query = (query or "").strip()
+    if len(stripped_query) < 2 or not any(c.isalnum() for c in stripped_query):
+        return create_rag_response(
+            query=query,
+            category=category,
+            function_name=function_name,
+            error_message=f"Query '{query}' is too short to search {category} information, please rephrase",
         )
 
-        similarity_content = process_rag_results(similarity_results, is_qa=False, random_selection=False)
-
-        # Search for QA results if requested
-        qa_content = ""
-        if include_qa:
-            qa_results = execute_rag_search(
-                query_embedding=query_embedding,
-                chunk_section=chunk_section,
-                search_qa=True,
-                threshold=threshold,
-                limit=limit,
-            )
-            qa_content = process_rag_results(qa_results, is_qa=True, random_selection=False)
+    try:
+        search_params = (chunk_section, threshold, limit, include_qa, ef_search)
+        exact_key = (normalize_query(query), *search_params)
+
+        with cache_lock:
+            contents: Optional[Tuple[str, str]] = rag_contents_cache.get(exact_key)
+
+        # Short queries of a section search are often just an entity name, answered from that entity's chunks
+        if contents is None and chunk_section and len(query.split()) <= MAX_ENTITY_NAME_WORDS:
+            contents = _exact_entity_contents(query, chunk_section, limit, include_qa)
+            if contents is not None:
+                with cache_lock:
+                    rag_contents_cache[exact_key] = contents
+
+        if contents is None:
+            # Generate embedding
+            query_embedding = generate_query_embedding(query)
+            if not query_embedding:
+                return create_rag_response(
+                    query=query,
+                    category=category,
+                    function_name=function_name,
+                    error_message=f"Failed to generate embedding for query '{query}'",
+                )
+
+            with cache_lock:
+                semantic_cache = rag_semantic_caches.get(search_params)
+                if semantic_cache is None:
+                    semantic_cache = rag_semantic_caches[search_params] = SemanticCache()
+                contents = semantic_cache.get(query_embedding)
+            if contents is None:
+                logger.debug("Semantic cache miss for %s (%d hits / %d misses)", search_params, semantic_cache.hits, semantic_cache.misses)
+                contents = _search_rag_contents(query, chunk_section, threshold, limit, include_qa, ef_search)
+                # Empty contents are not cached, searches also return [] on database errors
+                if any(contents):
+                    with cache_lock:
+                        semantic_cache.put(query_embedding, contents)
+
+            if any(contents):
+                with cache_lock:
+                    rag_contents_cache[exact_key] = contents
+
+        similarity_content, qa_content = contents
 
         # Create and return response
         return create_rag_response(
@@ -342,45 +720,88 @@ def execute_universal_rag(
 
 
 def search_qa_similarity(
-    query_embedding: List[float],
+    query_embedding: List[float] | str,
     limit: int = DEFAULT_RAG_SIMILARITY_LIMIT,
+    include_embedding: bool = False,
 ) -> List[Dict[str, Any]]:
     """
     Search QA vectors table for similar content using embeddings
 
     Args:
-        query_embedding: Vector embedding to compare against
-        threshold: Minimum similarity threshold
+        query_embedding: Vector embedding to compare against (or its to_vector_literal)
         limit: Maximum number of results
+        include_embedding: If True, also fetch each row's embedding (parsed to a float32 array)
 
     Returns:
-        List of dictionaries with similarity score and QA content
+        List of dictionaries with similarity score and QA content (and embedding if requested)
     """
-    embedding_str = "[" + ",".join(map(str, query_embedding)) + "]"
+    embedding_str = to_vector_literal(query_embedding)
     try:
-        query = """
-            SELECT 
-                id, 
-                1 - (embedding <=> %s::vector) as similarity,
-                chunk_text,
-                embedding
+        # Ordered by the distance itself so the HNSW index serves the LIMIT (see execute_rag_search).
+        # Runs on every user message (proactive smalltalk), prepared once per connection and variant.
+        query = f"""
+            WITH q AS (SELECT l2_normalize($1::halfvec) AS v)
+            SELECT
+                id,
+                -(embedding <#> (SELECT v FROM q)) as similarity,
+                chunk_text{", embedding" if include_embedding else ""}
             FROM rag_qa_vectors
-            ORDER BY similarity DESC
-            LIMIT %s
+            ORDER BY embedding <#> (SELECT v FROM q)
+            LIMIT $2
         """
-        params = (embedding_str, limit)
 
-        results = execute_query(query, params)
-        return [
+        results = execute_prepared(
+            "qa_similarity_embedding" if include_embedding else "qa_similarity",
+            query,
+            (embedding_str, limit),
+            f"SET LOCAL hnsw.ef_search = {max(MIN_HNSW_EF_SEARCH, 4 * limit)};",
+        )
+        qa_results = [
             {
                 "id": r["id"],
                 "similarity": float(r["similarity"]),
                 "content": r["chunk_text"],
-                "embedding": np.array([float(x) for x in r["embedding"].strip("[]").split(",")]),
             }
             for r in results
         ]
 
+        # Embeddings are only sent and parsed when the caller needs them
+        if include_embedding:
+            for qa, r in zip(qa_results, results):
+                qa["embedding"] = parse_vector(r["embedding"])
+
+        return qa_results
+
     except Exception as e:
         logger.error(f"Error searching QA vectors: {str(e)}")
         return []
+
+
+def warmup_rag(query: str = "warmup query"):
+    """
+    Preload the RAG search path so the first user queries don't pay the cold start:
+    HNSW index and table pages into shared_buffers (pg_prewarm, when the extension is installed, migration 017),
+    the Ollama embedding model, and one search per section to prepare and plan the statements.
+    The search caches are bypassed, the warmup query is never served as a result.
+    """
+    started = time.perf_counter()
+
+    if execute_query("SELECT 1 FROM pg_extension WHERE extname = 'pg_prewarm'"):
+        prewarm_sql = """
+        SELECT c.relname::text AS relation, pg_prewarm(c.oid) AS blocks
+        FROM pg_class c
+        JOIN pg_am am ON am.oid = c.relam
+        LEFT JOIN pg_index i ON i.indexrelid = c.oid
+        WHERE c.oid IN ('rag_vectors'::regclass, 'rag_qa_vectors'::regclass)
+           OR (i.indrelid IN ('rag_vectors'::regclass, 'rag_qa_vectors'::regclass) AND am.amname = 'hnsw')
+        """
+        prewarmed = execute_query(prewarm_sql)
+        logger.info(f"Prewarmed {sum(row['blocks'] for row in prewarmed)} blocks of {len(prewarmed)} RAG relations")
+
+    query_embedding = generate_query_embedding(query)
+    if query_embedding:
+        for chunk_section in RAG_SECTIONS:
+            execute_rag_search.__wrapped__(query, chunk_section)
+        search_qa_similarity(query_embedding)
+
+    logger.info(f"RAG warmup done in {time.perf_counter() - started:.2f}s")
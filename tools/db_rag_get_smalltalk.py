@@ -1,17 +1,38 @@
+import itertools
 import logging
 import random
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
 
 import numpy as np
-
-from db_postgres import execute_query
-from embedder import embd
+from cachetools import TTLCache
+
+from db_postgres import execute_prepared
+from tools.db_rag_common import (
+    MIN_HNSW_EF_SEARCH,
+    SemanticCache,
+    cache_lock,
+    generate_query_embedding,
+    normalize_query,
+    parse_vector,
+    to_vector_literal,
+)
 
 # Logger
 logger = logging.getLogger("DBSmalltalk")
 
 SIMILARITY_THRESHOLD = 0.4
 RAG_SMALLTALK_SEARCH_LIMIT = 10
+# How long the similarity path waits for the query embedding before answering with the random fallback
+SMALLTALK_EMBEDDING_TIMEOUT = 0.3
+
+# Similarity matches by normalized query, repeated smalltalk queries skip the embedding and the search
+smalltalk_match_cache = TTLCache(maxsize=512, ttl=600)
+# Similarity matches by query embedding, paraphrased queries skip the search
+smalltalk_semantic_cache = SemanticCache(maxsize=1024, similarity=0.95)
+
+# Runs the query embeddings, so a slow one can be abandoned after SMALLTALK_EMBEDDING_TIMEOUT
+embedding_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="SmalltalkEmbedding")
 
 SAMPLE_SMALLTALK_TOPICS = [
     "Since you're not asking about anything specific, I was just processing...",
@@ -33,178 +54,206 @@ Always refrase the answer to make it more natural, mandalorian style and droid h
 Then naturally transit into the topic using the knowledge provided. Incorporate military perspectives, tactical analysis, or academy anecdotes where appropriate. 
 """
 
+# Instruction with every 3 of the sample transition phrases, formatted once (120 variants)
+SMALLTALK_SPECIALIST_PROMPTS = [
+    SMALLTALK_SPECIALIST_EMBEDDING.format("\n".join(subset)) for subset in itertools.combinations(SAMPLE_SMALLTALK_TOPICS, 3)
+]
+
+
+def _select_random_smalltalk() -> List[dict]:
+    """Random smalltalk topic (topic, category, knowledge_text), empty list if there is none"""
+    # First row at or after a random point of the indexed rand column (migration 019), an index probe instead of
+    # sorting the whole table; the second branch wraps around and only runs when the first finds nothing
+    random_sql = """
+    (SELECT topic, category, knowledge_text FROM smalltalk_vectors WHERE rand >= $1 ORDER BY rand LIMIT 1)
+    UNION ALL
+    (SELECT topic, category, knowledge_text FROM smalltalk_vectors WHERE rand < $1 ORDER BY rand DESC LIMIT 1)
+    LIMIT 1
+    """
+
+    return execute_prepared("smalltalk_random", random_sql, (random.random(),))
 
-def _generate_query_embedding(query_text: str) -> list | None:
+
+def _search_smalltalk_match(query: str) -> Optional[dict]:
+    """
+    Random one of the topics most similar to the query (above SIMILARITY_THRESHOLD),
+    None if there is none or the query embedding is not ready in time
+    """
+    # Generate embedding using Ollama (memoized per normalized query, shared with the RAG tools).
+    # A slow embedding is not waited for, it still completes in the background and is cached for the next call
+    embedding_future = embedding_executor.submit(generate_query_embedding, query)
     try:
-        embedding = embd(query_text)
-        return embedding
+        query_embedding = embedding_future.result(timeout=SMALLTALK_EMBEDDING_TIMEOUT)
+    except TimeoutError:
+        logger.info(f"Embedding not ready within {SMALLTALK_EMBEDDING_TIMEOUT}s, falling back to random")
+        return None
 
-    except Exception as e:
-        logger.error(f"Failed to generate embedding for query: {e}")
+    if query_embedding is None:
+        logger.info("Embedding generation failed, falling back to random")
         return None
 
+    with cache_lock:
+        result = smalltalk_semantic_cache.get(query_embedding)
+    if result is not None:
+        logger.info("Using semantic cache match of a similar query")
+        return result
+
+    # Real pgvector similarity search
+    logger.info("Using Ollama embedding-based similarity search")
+
+    # Take the top similar results and pick one randomly for variety, on the server:
+    # only the chosen row is sent back, with the number of candidates it was picked from.
+    # The top rows come from the HNSW index (migration 020), the threshold is applied to them afterwards.
+    # Stored embeddings are unit length (migration 021), the cosine similarity is the negated inner product
+    similarity_sql = """
+    WITH q AS (SELECT l2_normalize($1::vector) AS v),
+    top_matches AS (
+        SELECT topic, category, knowledge_text,
+               -(embedding <#> (SELECT v FROM q)) as similarity
+        FROM smalltalk_vectors
+        ORDER BY embedding <#> (SELECT v FROM q)
+        LIMIT $2
+    ),
+    matches AS (
+        SELECT * FROM top_matches WHERE similarity >= $3
+    )
+    SELECT topic, category, knowledge_text, similarity,
+           (SELECT COUNT(*) FROM matches) as candidates_found
+    FROM matches
+    ORDER BY RANDOM()
+    LIMIT 1
+    """
+
+    results = execute_prepared(
+        "smalltalk_similarity",
+        similarity_sql,
+        (
+            to_vector_literal(query_embedding),
+            RAG_SMALLTALK_SEARCH_LIMIT,
+            SIMILARITY_THRESHOLD,
+        ),
+        f"SET LOCAL hnsw.ef_search = {max(MIN_HNSW_EF_SEARCH, 4 * RAG_SMALLTALK_SEARCH_LIMIT)};",
+    )
+
+    if not results:
+        logger.info(f"No embedding match above threshold {SIMILARITY_THRESHOLD}, falling back to random")
+        return None
+
+    with cache_lock:
+        smalltalk_semantic_cache.put(query_embedding, results[0])
+    return results[0]
+
+
+def _fetch_smalltalk_row(query: str) -> Tuple[Optional[dict], str]:
+    """
+    Smalltalk row for the query (topic, category, knowledge_text; similarity and candidates_found for a match)
+    and how it was selected: "random_selection" (empty query), "ollama_embedding_similarity_search" or
+    "random_fallback". The row is None when there are no smalltalk topics.
+    """
+    # Normalized once: a whitespace-only query is an empty query, never embedded
+    query = (query or "").strip()
+
+    # Case 1: Empty query - get random topic
+    if not query:
+        logger.info("Empty query received, selecting random smalltalk topic")
+
+        results = _select_random_smalltalk()
+        return (results[0] if results else None), "random_selection"
+
+    # Case 2: Query provided - perform embedding similarity search
+    logger.info(f"Searching for smalltalk context with query: {query}")
+
+    normalized_query = normalize_query(query)
+    with cache_lock:
+        result = smalltalk_match_cache.get(normalized_query)
+
+    if result is None:
+        result = _search_smalltalk_match(query)
+        # Only matches are cached, a random fallback is picked anew on every call
+        if result is not None:
+            with cache_lock:
+                smalltalk_match_cache[normalized_query] = result
+
+    if result is not None:
+        logger.info(f"Selected random result from {result['candidates_found']} similar topics")
+        return result, "ollama_embedding_similarity_search"
+
+    # No good match found - get random topic instead (fetched here, only after a miss or an embedding timeout)
+    logger.info(f"No good smalltalk match for query '{query}', selecting random topic")
+
+    results = _select_random_smalltalk()
+    return (results[0] if results else None), "random_fallback"
+
+
+def _format_smalltalk_row(row: dict, method: str) -> str:
+    source = "from" if method == "random_selection" else "in"
+    return f"### Information {source} galactic database: {row['topic']} ({row['category']})\n{row['knowledge_text']}"
+
 
 def db_rag_get_smalltalk(query: str = "") -> dict:
     try:
-        search_query = query if query else "random topic"
-
-        # Case 1: Empty query - get random topic
-        if not query or query.strip() == "":
-            logger.info("Empty query received, selecting random smalltalk topic")
-
-            random_sql = """
-            SELECT topic, category, knowledge_text
-            FROM smalltalk_vectors
-            ORDER BY RANDOM()
-            LIMIT 1
-            """
-
-            results = execute_query(random_sql)
-
-            if results:
-                result = results[0]
-                topic = result["topic"]
-                category = result["category"]
-                knowledge_text = result["knowledge_text"]
-
-                content = f"### Information from galactic database: {topic} ({category})\n{knowledge_text}"
-
-                random_subset = random.sample(SAMPLE_SMALLTALK_TOPICS, 3)
-
-                return {
-                    "status": "success",
-                    "message": "Selected random smalltalk topic",
-                    "search_query": search_query,
-                    "content": {"smltk_results": content},
-                    "llm_instruction": SMALLTALK_SPECIALIST_EMBEDDING.format("\n".join(random_subset)),
-                    "internal_info": {
-                        "function_name": "db_rag_get_smalltalk",
-                        "parameters": {"query": query},
-                        "method": "random_selection",
-                    },
-                }
-            else:
-                return {
-                    "status": "success",
-                    "message": "No smalltalk topics available in database",
-                    "search_query": search_query,
-                    "content": {"smltk_results": ""},
-                    "internal_info": {
-                        "function_name": "db_rag_get_smalltalk",
-                        "parameters": {"query": query},
-                    },
-                }
-
-        # Case 2: Query provided - perform embedding similarity search
-        else:
-            logger.info(f"Searching for smalltalk context with query: {query}")
-
-            # Generate embedding using Ollama
-            query_embedding = _generate_query_embedding(query)
-
-            if query_embedding is not None:
-                # Real pgvector similarity search
-                logger.info("Using Ollama embedding-based similarity search")
-
-                # Convert embedding to PostgreSQL vector format
-                embedding_str = "[" + ",".join(map(str, query_embedding)) + "]"
-
-                # Get multiple similar results and pick one randomly for variety
-                similarity_sql = """
-                SELECT topic, category, knowledge_text, 
-                       1 - (embedding <=> %s::vector) as similarity
-                FROM smalltalk_vectors
-                WHERE 1 - (embedding <=> %s::vector) >= %s
-                ORDER BY embedding <=> %s::vector
-                LIMIT %s
-                """
-
-                results = execute_query(
-                    similarity_sql,
-                    (
-                        embedding_str,
-                        embedding_str,
-                        SIMILARITY_THRESHOLD,
-                        embedding_str,
-                        RAG_SMALLTALK_SEARCH_LIMIT,
-                    ),
-                )
-
-                if results:
-                    # Randomly select one from the top similar results for variety
-                    result = random.choice(results)
-                    logger.info(f"Selected random result from {len(results)} similar topics")
-                    topic = result["topic"]
-                    category = result["category"]
-                    knowledge_text = result["knowledge_text"]
-                    similarity = result["similarity"]
-
-                    content = f"### Information in galactic database: {topic} ({category})\n{knowledge_text}"
-
-                    return {
-                        "status": "success",
-                        "message": f"Found smalltalk context for '{query}' (similarity: {similarity:.3f})",
-                        "search_query": search_query,
-                        "content": {"smltk_results": content},
-                        "llm_instruction": SMALLTALK_SPECIALIST_EMBEDDING,
-                        "internal_info": {
-                            "function_name": "db_rag_get_smalltalk",
-                            "parameters": {"query": query},
-                            "method": "ollama_embedding_similarity_search",
-                            "similarity_score": similarity,
-                            "threshold": SIMILARITY_THRESHOLD,
-                            "candidates_found": len(results),
-                        },
-                    }
-
-                logger.info(f"No embedding match above threshold {SIMILARITY_THRESHOLD}, falling back to random")
-
-            else:
-                logger.info("Embedding generation failed, falling back to random")
-
-            # No good match found - get random topic instead
-            logger.info(f"No good smalltalk match for query '{query}', selecting random topic")
-
-            random_sql = """
-            SELECT topic, category, knowledge_text
-            FROM smalltalk_vectors
-            ORDER BY RANDOM()
-            LIMIT 1
-            """
-
-            results = execute_query(random_sql)
-
-            if results:
-                result = results[0]
-                topic = result["topic"]
-                category = result["category"]
-                knowledge_text = result["knowledge_text"]
-
-                content = f"### Information in galactic database: {topic} ({category})\n{knowledge_text}"
-
-                return {
-                    "status": "success",
-                    "message": f"No specific match for '{query}', selected random smalltalk topic",
-                    "search_query": search_query,
-                    "content": {"smltk_results": content},
-                    "llm_instruction": SMALLTALK_SPECIALIST_EMBEDDING,
-                    "internal_info": {
-                        "function_name": "db_rag_get_smalltalk",
-                        "parameters": {"query": query},
-                        "method": "random_fallback",
-                    },
-                }
-            else:
-                return {
-                    "status": "success",
-                    "message": "No smalltalk topics available in database",
-                    "search_query": search_query,
-                    "content": {"smltk_results": ""},
-                    "internal_info": {
-                        "function_name": "db_rag_get_smalltalk",
-                        "parameters": {"query": query},
-                    },
-                }
+        search_query = (query or "").strip() or "random topic"
+
+        row, method = _fetch_smalltalk_row(query)
+
+        if row is None:
+            return {
+                "status": "success",
+                "message": "No smalltalk topics available in database",
+                "search_query": search_query,
+                "content": {"smltk_results": ""},
+                "internal_info": {
+                    "function_name": "db_rag_get_smalltalk",
+                    "parameters": {"query": query},
+                },
+            }
+
+        content = _format_smalltalk_row(row, method)
+
+        if method == "random_selection":
+            return {
+                "status": "success",
+                "message": "Selected random smalltalk topic",
+                "search_query": search_query,
+                "content": {"smltk_results": content},
+                "llm_instruction": random.choice(SMALLTALK_SPECIALIST_PROMPTS),
+                "internal_info": {
+                    "function_name": "db_rag_get_smalltalk",
+                    "parameters": {"query": query},
+                    "method": method,
+                },
+            }
+
+        if method == "ollama_embedding_similarity_search":
+            similarity = row["similarity"]
+            return {
+                "status": "success",
+                "message": f"Found smalltalk context for '{query}' (similarity: {similarity:.3f})",
+                "search_query": search_query,
+                "content": {"smltk_results": content},
+                "llm_instruction": SMALLTALK_SPECIALIST_EMBEDDING,
+                "internal_info": {
+                    "function_name": "db_rag_get_smalltalk",
+                    "parameters": {"query": query},
+                    "method": method,
+                    "similarity_score": similarity,
+                    "threshold": SIMILARITY_THRESHOLD,
+                    "candidates_found": row["candidates_found"],
+                },
+            }
+
+        return {
+            "status": "success",
+            "message": f"No specific match for '{query}', selected random smalltalk topic",
+            "search_query": search_query,
+            "content": {"smltk_results": content},
+            "llm_instruction": SMALLTALK_SPECIALIST_EMBEDDING,
+            "internal_info": {
+                "function_name": "db_rag_get_smalltalk",
+                "parameters": {"query": query},
+                "method": method,
+            },
+        }
 
     except Exception as e:
         logger.error(f"Error in db_get_smalltalk: {str(e)}")
@@ -222,46 +271,56 @@ def db_rag_get_smalltalk(query: str = "") -> dict:
 
 
 def db_rag_get_smalltalk_from_embedding(
-    embeddings: List[float],
+    embeddings: List[float] | np.ndarray | str,
     RAG_SMALLTALK_SEARCH_LIMIT: int = 2,
+    include_embedding: bool = False,
 ) -> List[dict]:
-    if not embeddings:
+    # len() instead of truthiness, which is ambiguous for an ndarray
+    if embeddings is None or len(embeddings) == 0:
         return []
 
-    # Convert embedding to PostgreSQL vector format
-    embedding_str = "[" + ",".join(map(str, embeddings)) + "]"
-
-    # Combined similarity search using both embedding types
-    similarity_sql = """
-    WITH combined_results AS (
-        SELECT id, topic, category, knowledge_text, short_knowledge_text, embedding,
-                1 - (embedding <=> %s::vector) as similarity,
-                'embedding' as search_type
-        FROM smalltalk_vectors
-        
-        UNION ALL
-        
-        SELECT id, topic, category, knowledge_text, short_knowledge_text, topic_embedding as embedding,
-                1 - (topic_embedding <=> %s::vector) as similarity,
-                'topic_embedding' as search_type  
-        FROM smalltalk_vectors
+    # Convert embedding to PostgreSQL vector format (no-op for an already converted literal)
+    embedding_str = to_vector_literal(embeddings)
+
+    # Combined similarity search using both embedding types: each row's similarity is that of its closer embedding
+    # (the one returned if requested), the query vector is sent and cast once.
+    # The best rows by the closer embedding are among the best rows of either embedding, so the candidates come from
+    # one HNSW index scan per embedding (migration 020) and only those are scored.
+    # Embeddings are unit length (migration 021), distances are negated inner products
+    embedding_column = (
+        "CASE WHEN d.embedding_distance <= d.topic_distance THEN embedding ELSE topic_embedding END as embedding,"
+        if include_embedding
+        else ""
+    )
+    similarity_sql = f"""
+    WITH q AS (SELECT l2_normalize($1::vector) AS v),
+    candidates AS (
+        (SELECT id FROM smalltalk_vectors ORDER BY embedding <#> (SELECT v FROM q) LIMIT $2)
+        UNION
+        (SELECT id FROM smalltalk_vectors ORDER BY topic_embedding <#> (SELECT v FROM q) LIMIT $2)
     )
-    SELECT * FROM (
-        SELECT DISTINCT ON (id) id, topic, category, knowledge_text, short_knowledge_text, embedding, similarity, search_type
-        FROM combined_results
-        ORDER BY id, similarity DESC
-    ) t
-    ORDER BY similarity DESC
-    LIMIT %s
+    SELECT id, topic, category, knowledge_text, short_knowledge_text,
+           {embedding_column}
+           -LEAST(d.embedding_distance, d.topic_distance) as similarity,
+           CASE WHEN d.embedding_distance <= d.topic_distance THEN 'embedding' ELSE 'topic_embedding' END as search_type
+    FROM smalltalk_vectors
+         JOIN candidates USING (id),
+         LATERAL (
+             SELECT embedding <#> (SELECT v FROM q) as embedding_distance,
+                    topic_embedding <#> (SELECT v FROM q) as topic_distance
+         ) d
+    ORDER BY LEAST(d.embedding_distance, d.topic_distance)
+    LIMIT $2
     """
 
-    results = execute_query(
+    results = execute_prepared(
+        "smalltalk_combined_embedding" if include_embedding else "smalltalk_combined",
         similarity_sql,
         (
-            embedding_str,
             embedding_str,
             RAG_SMALLTALK_SEARCH_LIMIT,
         ),
+        f"SET LOCAL hnsw.ef_search = {max(MIN_HNSW_EF_SEARCH, 4 * RAG_SMALLTALK_SEARCH_LIMIT)};",
     )
 
     if not results:
@@ -274,12 +333,16 @@ def db_rag_get_smalltalk_from_embedding(
             "similarity": float(r["similarity"]),
             "long_content": f"### {r['topic']} ({r['category']})\n{r['knowledge_text']}",
             "content": f"### {r['topic']}\n{r['short_knowledge_text']}",
-            "embedding": np.array([float(x) for x in r["embedding"].strip("[]").split(",")]),
             "search_type": r["search_type"],
         }
         for r in results
     ]
 
+    # Embeddings are only sent and parsed when the caller needs them
+    if include_embedding:
+        for smalltalk, r in zip(formatted_results, results):
+            smalltalk["embedding"] = parse_vector(r["embedding"])
+
     return formatted_results
 
 
@@ -293,11 +356,10 @@ def db_get_smalltalk_text(query: str = "") -> str:
     Returns:
         str: Smalltalk context information in text format
     """
-    # Use the main function and extract text content
-    json_result = db_rag_get_smalltalk(query)
-
-    result_dict = json_result
-    if result_dict.get("status") == "success":
-        return result_dict["content"]["smltk_results"]
-    else:
+    # Only the row is fetched, none of the tool response around it is built
+    try:
+        row, method = _fetch_smalltalk_row(query)
+        return _format_smalltalk_row(row, method) if row is not None else ""
+    except Exception as e:
+        logger.error(f"Error in db_get_smalltalk_text: {str(e)}")
         return ""
@@ -1,9 +1,9 @@
-import json
 import logging
 import os
 import socket
 import sys
 import textwrap
+import threading
 import time
 from typing import Any, Dict
 
@@ -12,9 +12,10 @@ from dotenv import dotenv_values, load_dotenv
 from db_postgres import initialize_postgres_db
 from game_state_parser.parser import GameStateParser
 from session import Session
+from tools.db_rag_common import warmup_rag
 from workload_chat import process_main_channel
 from workload_config import SERVER_HOST, SERVER_PORT, WORKLOAD_CONFIG
-from workload_tools import create_response, send_message, send_response
+from workload_tools import create_response, json_dumps_bytes, json_loads, send_message, send_response
 
 # Load environment variables from .env file
 load_dotenv()
@@ -27,6 +28,9 @@ logger = logging.LoggerAdapter(logger)
 
 active_sessions: Dict[str, Any] = {}
 
+# The RAG warmup runs once per process, not again on every reconnect
+rag_warmup_started = threading.Event()
+
 
 def connect_to_server():
     """Connect to RathTAR socket server"""
@@ -60,7 +64,7 @@ def register_workload(client):
     try:
         # Send registration data
         logger.info(f"REGISTERING: title={registration['title']}, hash_id={registration['hash_id']}")
-        reg_data = json.dumps(registration).encode("utf-8")
+        reg_data = json_dumps_bytes(registration)
         client.sendall(reg_data)
 
         response = client.recv(4096)
@@ -69,7 +73,7 @@ def register_workload(client):
             logger.error("ERROR: no response from server")
             return None
 
-        data = json.loads(response.decode("utf-8"))
+        data = json_loads(response)
         if data.get("status") == "connected":
             workload_id = data.get("id")
             logger.info(f"SUCCESS: workload_id={workload_id}")
@@ -124,7 +128,7 @@ def process_message(client, message):
         raw_message = message.decode("utf-8")
         # Log limited data preview for privacy/brevity
 
-        data = json.loads(raw_message)
+        data = json_loads(raw_message)
 
         # Extract common message data
         message_type = data.get("type")
@@ -141,8 +145,9 @@ def process_message(client, message):
             extra=dict(session_id=session.session_id, message_id=session.message_id),
         )
 
-        # Wrap preview text for better readability
-        preview_text = textwrap.shorten(raw_message, width=250)
+        # Wrap preview text for better readability, only the head of the message is scanned
+        # (data messages carry the whole game state)
+        preview_text = textwrap.shorten(raw_message[:1000], width=250)
         logger.info("PREVIEW", extra=dict(preview=preview_text))
 
         # Handle message based on its type
@@ -243,7 +248,7 @@ def request_json_data(client, session_id):
 def process_json_data_message(client, session: Session, data: dict):
     try:
         json_data = data["data"]
-        data_size_bytes = len(json.dumps(json_data))
+        data_size_bytes = len(json_dumps_bytes(json_data))
         data_size_kb = data_size_bytes / 1024
 
         logger.info(
@@ -255,7 +260,8 @@ def process_json_data_message(client, session: Session, data: dict):
             ),
         )
 
-        session.game_state = GameStateParser(json.dumps(json_data))
+        # Already decoded with the message, the parser takes the dict as is
+        session.game_state = GameStateParser(json_data)
 
         response = {
             "type": "data_received",
@@ -383,7 +389,10 @@ def reconnect_loop():
         # Reset retry interval on successful connection
         retry_interval = 1
 
-        initialize_postgres_db()
+        # Warm the RAG indexes and embedding model while the workload registers and waits for messages
+        if initialize_postgres_db() and not rag_warmup_started.is_set():
+            rag_warmup_started.set()
+            threading.Thread(target=warmup_rag, name="RAGWarmup", daemon=True).start()
 
         try:
             # Register workload
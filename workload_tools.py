@@ -4,10 +4,11 @@ Workload Tools
 Utility functions for the workload
 """
 
-import json
 import logging
 import socket
 
+import orjson
+
 logger = logging.getLogger("WorkloadTools")
 
 
@@ -59,6 +60,24 @@ def is_host_reachable(host, port=11434, timeout=2):
         return False
 
 
+def json_dumps_bytes(obj, indent: bool = False) -> bytes:
+    """Serialize obj to UTF-8 encoded JSON bytes (orjson, unknown types via str)"""
+    option = orjson.OPT_NON_STR_KEYS
+    if indent:
+        option |= orjson.OPT_INDENT_2
+    return orjson.dumps(obj, default=str, option=option)
+
+
+def json_dumps(obj, indent: bool = False) -> str:
+    """Serialize obj to a JSON string (orjson, unknown types via str)"""
+    return json_dumps_bytes(obj, indent).decode("utf-8")
+
+
+def json_loads(data: bytes | str):
+    """Parse JSON from bytes or str (orjson, errors are json.JSONDecodeError subclasses)"""
+    return orjson.loads(data)
+
+
 def create_response(channel, result="", session_id=None, message_id=None, extra_data=None):
     """Create a standardized response object"""
     response = {"type": "response", "channel": channel, "result": result}
@@ -111,8 +130,7 @@ def send_response(client, response, session_id=None, channel=0, message_id=None)
 def send_message(client, message_data):
     """Send a message to the server with reliability checks"""
     # Convert to JSON
-    json_data = json.dumps(message_data)
-    encoded_data = json_data.encode("utf-8")
+    encoded_data = json_dumps_bytes(message_data)
 
     # Log message being sent
     message_type = message_data.get("type", "unknown")